@@ -11,7 +11,7 @@ from contextlib import asynccontextmanager
 import asyncio
 from datetime import datetime
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from models.analytical_model import AnalyticalModel
 from models.chatbot_model import ChatbotModel
@@ -274,14 +274,21 @@ async def get_model_status():
         "timestamp": datetime.utcnow()
     }
 
+# Longest a status request may be held open waiting for a change (seconds)
+MAX_STATUS_WAIT = 60
+
 @app.get("/training/status")
-async def get_training_status():
+async def get_training_status(since: Optional[int] = None, wait: float = 0):
     """
-    Get current training status
+    Get current training status. With `since` (a previously returned revision) and `wait`,
+    the request is held until the status changes or `wait` seconds pass.
     """
     if not auto_trainer:
         raise HTTPException(status_code=503, detail="Auto trainer not initialized")
     
+    if since is not None and wait > 0:
+        await auto_trainer.wait_for_status_change(since, min(wait, MAX_STATUS_WAIT))
+    
     return auto_trainer.get_training_status()
 
 @app.post("/training/start")
@@ -71,6 +71,10 @@ class AutoTrainer:
         self.performance_history: List[TrainingMetrics] = []
         self.model_performance: Dict[str, ModelPerformance] = {}
         
+        # Training status revision; bumped on every status change so clients can long-poll
+        self.status_revision = 0
+        self._status_changed = asyncio.Event()
+        
         # Training flags
         self.is_training = False
         self.training_progress = 0.0
@@ -669,9 +673,52 @@ class AutoTrainer:
         except Exception as e:
             logger.error(f"Error updating performance history: {e}")
     
+    @property
+    def is_training(self) -> bool:
+        return self._is_training
+    
+    @is_training.setter
+    def is_training(self, value: bool):
+        self._is_training = value
+        self._notify_status_change()
+    
+    @property
+    def training_progress(self) -> float:
+        return self._training_progress
+    
+    @training_progress.setter
+    def training_progress(self, value: float):
+        self._training_progress = value
+        self._notify_status_change()
+    
+    @property
+    def current_training_stage(self) -> str:
+        return self._current_training_stage
+    
+    @current_training_stage.setter
+    def current_training_stage(self, value: str):
+        self._current_training_stage = value
+        self._notify_status_change()
+    
+    def _notify_status_change(self):
+        """Bump the status revision and wake long-polling status requests"""
+        self.status_revision += 1
+        self._status_changed.set()
+        self._status_changed = asyncio.Event()
+    
+    async def wait_for_status_change(self, since: int, timeout: float):
+        """Wait until the status revision differs from `since`, or until timeout"""
+        if self.status_revision != since:
+            return
+        try:
+            await asyncio.wait_for(self._status_changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
     def get_training_status(self) -> Dict[str, Any]:
         """Get current training status"""
         return {
+            'revision': self.status_revision,
             'is_training': self.is_training,
             'progress': self.training_progress,
             'current_stage': self.current_training_stage,
@@ -5,15 +5,21 @@ Handles real-time and historical stock data from multiple sources
 
 import asyncio
 import aiohttp
+import base64
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import os
+import time
+import weakref
 from dataclasses import dataclass
+from functools import lru_cache
 import redis
 import json
+from cachetools import TLRUCache
+import lz4.frame as lz4f
 from alpha_vantage.timeseries import TimeSeries
 from alpha_vantage.fundamentaldata import FundamentalData
 
@@ -21,6 +27,35 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Longest a value read from Redis is reused from process memory; never past the Redis key's own expiry
+LOCAL_CACHE_TTL = 30
+
+# Cached payloads larger than this are LZ4-compressed; the first byte tags the encoding
+COMPRESSION_THRESHOLD = 4096
+PAYLOAD_RAW = b'R'
+PAYLOAD_LZ4 = b'L'
+
+def _pack_payload(payload: bytes) -> bytes:
+    if len(payload) > COMPRESSION_THRESHOLD:
+        return PAYLOAD_LZ4 + lz4f.compress(payload, compression_level=1)
+    return PAYLOAD_RAW + payload
+
+def _unpack_payload(payload: bytes) -> bytes:
+    tag, body = payload[:1], payload[1:]
+    if tag == PAYLOAD_LZ4:
+        return lz4f.decompress(body)
+    if tag == PAYLOAD_RAW:
+        return body
+    # Untagged JSON written before compression was introduced
+    return payload
+
+def _close_redis(client: redis.Redis):
+    """Close a Redis client outside of any event loop"""
+    try:
+        client.close()
+    except Exception:
+        pass
+
 @dataclass
 class StockData:
     symbol: str
@@ -32,13 +67,56 @@ class StockData:
     volume: int
     adjusted_close: Optional[float] = None
 
-@dataclass
+@dataclass(frozen=True)
 class MarketStatus:
     is_open: bool
     next_open: Optional[datetime]
     next_close: Optional[datetime]
     timezone: str
 
+@lru_cache(maxsize=1440)
+def _compute_market_status(day: date, hour: int, minute: int) -> MarketStatus:
+    """
+    Compute market status for a given minute.
+    Memoized so repeated calls within the same minute return the same object.
+    """
+    now = datetime.combine(day, datetime.min.time()).replace(hour=hour, minute=minute)
+    
+    # US market hours: 9:30 AM - 4:00 PM ET, Monday-Friday
+    market_open_time = now.replace(hour=9, minute=30)
+    market_close_time = now.replace(hour=16, minute=0)
+    
+    is_weekday = now.weekday() < 5  # Monday = 0, Sunday = 6
+    is_market_hours = market_open_time <= now <= market_close_time
+    
+    is_open = is_weekday and is_market_hours
+    
+    # Calculate next open/close
+    if is_open:
+        next_close = market_close_time
+        next_open = None
+    else:
+        if now < market_open_time and is_weekday:
+            next_open = market_open_time
+        else:
+            # Next business day
+            days_ahead = 1
+            if now.weekday() == 4:  # Friday
+                days_ahead = 3  # Skip to Monday
+            elif now.weekday() == 5:  # Saturday
+                days_ahead = 2  # Skip to Monday
+            
+            next_open = (now + timedelta(days=days_ahead)).replace(hour=9, minute=30)
+        
+        next_close = None
+    
+    return MarketStatus(
+        is_open=is_open,
+        next_open=next_open,
+        next_close=next_close,
+        timezone="US/Eastern"
+    )
+
 class DataService:
     """
     Unified data service for stock market data
@@ -49,6 +127,7 @@ class DataService:
         self.polygon_key = os.getenv('POLYGON_API_KEY')
         self.redis_client = None
         self.session = None
+        self._finalizer = None
         
         # Data sources
         self.alpha_vantage_ts = None
@@ -61,6 +140,9 @@ class DataService:
             'historical': 86400,  # 24 hours for historical data
         }
         
+        # Process-local cache in front of Redis for hot keys; entries are (value, expires_at)
+        self.local_cache = TLRUCache(maxsize=4096, ttu=lambda key, entry, now: entry[1], timer=time.monotonic)
+        
         # Rate limiting
         self.rate_limits = {
             'alpha_vantage': {'calls': 5, 'period': 60},  # 5 calls per minute
@@ -73,16 +155,30 @@ class DataService:
         try:
             logger.info("Initializing Data Service...")
             
-            # Initialize Redis for caching
-            self.redis_client = redis.Redis(
-                host=os.getenv('REDIS_HOST', 'localhost'),
-                port=int(os.getenv('REDIS_PORT', 6379)),
-                decode_responses=True
+            # Initialize Redis for caching (Unix socket when co-located, TCP otherwise)
+            redis_socket = os.getenv('REDIS_UNIX_SOCKET')
+            if redis_socket:
+                self.redis_client = redis.Redis(unix_socket_path=redis_socket)
+            else:
+                self.redis_client = redis.Redis(
+                    host=os.getenv('REDIS_HOST', 'localhost'),
+                    port=int(os.getenv('REDIS_PORT', 6379))
+                )
+            
+            # Best-effort Redis cleanup if close() is never awaited; never touches the event loop
+            self._finalizer = weakref.finalize(self, _close_redis, self.redis_client)
+            
+            # Initialize HTTP session with a pooled keep-alive connector
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=32,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=10)
             )
             
-            # Initialize HTTP session
-            self.session = aiohttp.ClientSession()
-            
             # Initialize Alpha Vantage
             if self.alpha_vantage_key:
                 self.alpha_vantage_ts = TimeSeries(key=self.alpha_vantage_key, output_format='pandas')
@@ -147,37 +243,52 @@ class DataService:
             if cached_price is not None:
                 return cached_price
             
-            # Fetch real-time data
-            price_data = await self._fetch_realtime_yahoo(symbol)
-            
-            if price_data:
-                await self._set_cache(cache_key, price_data, self.cache_ttl['intraday'])
-                return price_data
-            
-            # Fallback to Alpha Vantage
-            if self.alpha_vantage_key:
-                price_data = await self._fetch_realtime_alpha_vantage(symbol)
-                if price_data:
-                    await self._set_cache(cache_key, price_data, self.cache_ttl['intraday'])
-                    return price_data
-            
-            raise Exception(f"No real-time data available for {symbol}")
+            return await self._fetch_and_cache_realtime(symbol)
             
         except Exception as e:
             logger.error(f"Error getting real-time price for {symbol}: {e}")
             raise
     
+    async def _fetch_and_cache_realtime(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch a real-time quote from upstream sources and cache it
+        """
+        cache_key = f"realtime:{symbol}"
+        
+        # Fetch real-time data
+        price_data = await self._fetch_realtime_yahoo(symbol)
+        
+        if price_data:
+            await self._set_cache(cache_key, price_data, self.cache_ttl['intraday'])
+            return price_data
+        
+        # Fallback to Alpha Vantage
+        if self.alpha_vantage_key:
+            price_data = await self._fetch_realtime_alpha_vantage(symbol)
+            if price_data:
+                await self._set_cache(cache_key, price_data, self.cache_ttl['intraday'])
+                return price_data
+        
+        raise Exception(f"No real-time data available for {symbol}")
+    
     async def get_multiple_stocks(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get real-time data for multiple stocks efficiently
         """
         try:
+            # One cache round trip for all symbols; only misses go upstream
+            cached = await self._get_many_from_cache([f"realtime:{symbol}" for symbol in symbols])
+            results = {symbol: cached[f"realtime:{symbol}"] for symbol in symbols if f"realtime:{symbol}" in cached}
+            misses = [symbol for symbol in symbols if symbol not in results]
+            
+            if not misses:
+                return results
+            
             tasks = []
-            for symbol in symbols:
-                task = asyncio.create_task(self.get_real_time_price(symbol))
+            for symbol in misses:
+                task = asyncio.create_task(self._fetch_and_cache_realtime(symbol))
                 tasks.append((symbol, task))
             
-            results = {}
             for symbol, task in tasks:
                 try:
                     results[symbol] = await task
@@ -196,57 +307,8 @@ class DataService:
         Get current market status
         """
         try:
-            cache_key = "market_status"
-            
-            # Check cache
-            cached_status = await self._get_from_cache(cache_key)
-            if cached_status is not None:
-                return MarketStatus(**cached_status)
-            
-            # Calculate market status
             now = datetime.now()
-            
-            # US market hours: 9:30 AM - 4:00 PM ET, Monday-Friday
-            market_open_time = now.replace(hour=9, minute=30, second=0, microsecond=0)
-            market_close_time = now.replace(hour=16, minute=0, second=0, microsecond=0)
-            
-            is_weekday = now.weekday() < 5  # Monday = 0, Sunday = 6
-            is_market_hours = market_open_time <= now <= market_close_time
-            
-            is_open = is_weekday and is_market_hours
-            
-            # Calculate next open/close
-            if is_open:
-                next_close = market_close_time
-                next_open = None
-            else:
-                if now < market_open_time and is_weekday:
-                    next_open = market_open_time
-                else:
-                    # Next business day
-                    days_ahead = 1
-                    if now.weekday() == 4:  # Friday
-                        days_ahead = 3  # Skip to Monday
-                    elif now.weekday() == 5:  # Saturday
-                        days_ahead = 2  # Skip to Monday
-                    
-                    next_open = (now + timedelta(days=days_ahead)).replace(
-                        hour=9, minute=30, second=0, microsecond=0
-                    )
-                
-                next_close = None
-            
-            status = MarketStatus(
-                is_open=is_open,
-                next_open=next_open,
-                next_close=next_close,
-                timezone="US/Eastern"
-            )
-            
-            # Cache for 1 minute
-            await self._set_cache(cache_key, status.__dict__, 60)
-            
-            return status
+            return _compute_market_status(now.date(), now.hour, now.minute)
             
         except Exception as e:
             logger.error(f"Error getting market status: {e}")
@@ -312,16 +374,31 @@ class DataService:
             if data.empty:
                 return None
             
-            # Standardize column names
-            data.columns = [col.lower().replace(' ', '_') for col in data.columns]
-            data.reset_index(inplace=True)
+            # Standardize column names, keeping the DatetimeIndex in place
+            data.columns = data.columns.str.lower().str.replace(' ', '_', regex=False)
             
-            return data
+            return self._downcast_ohlcv(data)
             
         except Exception as e:
             logger.error(f"Error fetching Yahoo Finance data for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _downcast_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Store prices as float32 and volume as int32 to halve memory and cache size.
+        float32 keeps ~7 significant digits (<1e-6 relative error), plenty for equity prices.
+        """
+        for col in ('open', 'high', 'low', 'close', 'adj_close', 'adjusted_close'):
+            if col in data.columns:
+                data[col] = data[col].astype(np.float32, copy=False)
+        
+        # Split-adjusted volume can exceed int32 range for some tickers
+        if 'volume' in data.columns and data['volume'].max() <= np.iinfo(np.int32).max:
+            data['volume'] = data['volume'].astype(np.int32, copy=False)
+        
+        return data
+    
     async def _fetch_stock_data_alpha_vantage(
         self, 
         symbol: str, 
@@ -342,16 +419,18 @@ class DataService:
             if data.empty:
                 return None
             
-            # Standardize format
-            data.reset_index(inplace=True)
-            data.columns = ['date', 'open', 'high', 'low', 'close', 'adjusted_close', 'volume', 'dividend', 'split']
+            # Standardize format to match Yahoo: oldest-first DatetimeIndex (Alpha Vantage sends newest first)
+            data.columns = ['open', 'high', 'low', 'close', 'adjusted_close', 'volume', 'dividend', 'split']
+            data.index = pd.to_datetime(data.index)
+            data.index.name = 'date'
+            data = data.sort_index()
             
             # Filter by period
             if period == '1y':
                 cutoff_date = datetime.now() - timedelta(days=365)
-                data = data[data['date'] >= cutoff_date]
+                data = data[data.index >= cutoff_date]
             
-            return data
+            return self._downcast_ohlcv(data)
             
         except Exception as e:
             logger.error(f"Error fetching Alpha Vantage data for {symbol}: {e}")
@@ -414,12 +493,22 @@ class DataService:
         Get data from Redis cache
         """
         try:
+            entry = self.local_cache.get(key)
+            if entry is not None:
+                return self._detached(entry[0])
+            
             if not self.redis_client:
                 return None
             
-            cached_data = self.redis_client.get(key)
+            # Value and remaining TTL in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            cached_data, ttl_ms = pipe.execute()
             if cached_data:
-                return json.loads(cached_data)
+                value = self._decode_cached(json.loads(_unpack_payload(cached_data)))
+                self._cache_locally(key, value, ttl_ms)
+                return self._detached(value)
             
             return None
             
@@ -427,25 +516,130 @@ class DataService:
             logger.warning(f"Cache get error for key {key}: {e}")
             return None
     
+    async def _get_many_from_cache(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several keys at once: local cache first, then a single Redis MGET
+        """
+        found = {}
+        try:
+            remote_keys = []
+            for key in keys:
+                entry = self.local_cache.get(key)
+                if entry is not None:
+                    found[key] = self._detached(entry[0])
+                else:
+                    remote_keys.append(key)
+            
+            if not remote_keys or not self.redis_client:
+                return found
+            
+            # MGET plus each key's remaining TTL, still a single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.mget(remote_keys)
+            for key in remote_keys:
+                pipe.pttl(key)
+            values, *ttls = pipe.execute()
+            
+            for key, cached_data, ttl_ms in zip(remote_keys, values, ttls):
+                if cached_data:
+                    value = self._decode_cached(json.loads(_unpack_payload(cached_data)))
+                    self._cache_locally(key, value, ttl_ms)
+                    found[key] = self._detached(value)
+            
+            return found
+            
+        except Exception as e:
+            logger.warning(f"Cache mget error: {e}")
+            return found
+    
+    def _cache_locally(self, key: str, value: Any, ttl_ms: int):
+        """
+        Keep a Redis value in process memory for up to LOCAL_CACHE_TTL seconds,
+        but no longer than the Redis key has left (PTTL: -1 no expiry, -2 already gone)
+        """
+        if ttl_ms == -2:
+            return
+        ttl = LOCAL_CACHE_TTL if ttl_ms < 0 else min(LOCAL_CACHE_TTL, ttl_ms / 1000)
+        self.local_cache[key] = (value, time.monotonic() + ttl)
+    
+    @staticmethod
+    def _detached(value: Any) -> Any:
+        """Copy of a cached DataFrame or dict, so callers cannot modify the shared cache entry"""
+        if isinstance(value, (pd.DataFrame, dict)):
+            return value.copy()
+        return value
+    
+    @staticmethod
+    def _encode_frame(data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Columnar cache form of a DataFrame.
+        Numeric and datetime columns travel as base64 raw bytes with their dtype, so float32/int32
+        stay compact and come back unchanged; other columns fall back to JSON lists.
+        """
+        columns = []
+        for col in data.columns:
+            values = data[col].to_numpy()
+            if values.dtype.kind in 'biufM':
+                columns.append({
+                    'dtype': values.dtype.str,
+                    'bytes': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+                })
+            else:
+                columns.append({'values': values.tolist()})
+        
+        frame = {'type': 'dataframe', 'format': 'columnar', 'columns': data.columns.tolist(), 'data': columns}
+        if isinstance(data.index, pd.DatetimeIndex):
+            # Epoch nanoseconds avoid per-timestamp string formatting
+            frame['index'] = data.index.as_unit('ns').asi8.tolist()
+            frame['index_tz'] = str(data.index.tz) if data.index.tz else None
+        else:
+            frame['index'] = data.index.tolist()
+        return frame
+    
+    @staticmethod
+    def _decode_cached(value: Any) -> Any:
+        """
+        Rebuild DataFrames stored by _set_cache
+        """
+        if not (isinstance(value, dict) and value.get('type') == 'dataframe'):
+            return value
+        
+        if 'index_tz' in value:
+            index = pd.to_datetime(value['index'], utc=True)
+            index = index.tz_convert(value['index_tz']) if value['index_tz'] else index.tz_localize(None)
+        else:
+            index = value['index']
+        
+        # Row records written before the columnar format
+        if value.get('format') != 'columnar':
+            return pd.DataFrame(value['data'], columns=value['columns'], index=index)
+        
+        columns = {}
+        for name, column in zip(value['columns'], value['data']):
+            if 'bytes' in column:
+                # bytearray keeps the decoded column writable
+                columns[name] = np.frombuffer(bytearray(base64.b64decode(column['bytes'])), dtype=column['dtype'])
+            else:
+                columns[name] = column['values']
+        return pd.DataFrame(columns, columns=value['columns'], index=index)
+    
     async def _set_cache(self, key: str, data: Any, ttl: int):
         """
         Set data in Redis cache
         """
         try:
+            self.local_cache.pop(key, None)
+            
             if not self.redis_client:
                 return
             
             # Handle pandas DataFrame
             if isinstance(data, pd.DataFrame):
-                data_dict = {
-                    'data': data.to_dict('records'),
-                    'columns': data.columns.tolist(),
-                    'index': data.index.tolist(),
-                    'type': 'dataframe'
-                }
-                self.redis_client.setex(key, ttl, json.dumps(data_dict, default=str))
+                payload = json.dumps(self._encode_frame(data), default=str)
             else:
-                self.redis_client.setex(key, ttl, json.dumps(data, default=str))
+                payload = json.dumps(data, default=str)
+            
+            self.redis_client.setex(key, ttl, _pack_payload(payload.encode('utf-8')))
                 
         except Exception as e:
             logger.warning(f"Cache set error for key {key}: {e}")
@@ -456,13 +650,16 @@ class DataService:
         """
         if self.session:
             await self.session.close()
+            self.session = None
         
-        if self.redis_client:
-            self.redis_client.close()
+        if self._finalizer:
+            # Closes the Redis client exactly once
+            self._finalizer()
+        self.redis_client = None
     
-    def __del__(self):
-        """
-        Cleanup on deletion
-        """
-        if hasattr(self, 'session') and self.session:
-            asyncio.create_task(self.session.close())
+    async def __aenter__(self) -> 'DataService':
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
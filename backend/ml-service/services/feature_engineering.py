@@ -6,29 +6,138 @@ Generates comprehensive features for ML model training
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any
-import pandas_ta as ta
+from collections import OrderedDict
+from numpy.lib.stride_tricks import sliding_window_view
 import talib
 from datetime import datetime, timedelta
 import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.logger import setup_logger
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 logger = setup_logger(__name__)
 
+def _group_offsets(groups: tuple) -> Dict[str, slice]:
+    """Map each feature group to its slice of the feature vector"""
+    offsets, start = {}, 0
+    for name, width in groups:
+        offsets[name] = slice(start, start + width)
+        start += width
+    return offsets
+
+def _as_pandas_frame(data):
+    """
+    Wrap a Polars frame's OHLCV columns in a pandas frame.
+    Numeric columns without nulls are exported zero-copy; pandas frames pass through.
+    """
+    if pl is None or not isinstance(data, pl.DataFrame):
+        return data
+    
+    # Equality against the dtype classes matches any time unit or zone on every Polars version
+    time_column = next(
+        (col for col in ('timestamp', 'datetime', 'date', 'time')
+         if col in data.columns and data[col].dtype in (pl.Datetime, pl.Date)),
+        None
+    )
+    index = None
+    if time_column:
+        index = pd.DatetimeIndex(data[time_column].to_numpy())
+        # to_numpy() yields UTC instants for zoned datetimes; restore the zone so hours stay local
+        time_zone = getattr(data[time_column].dtype, 'time_zone', None)
+        if time_zone:
+            index = index.tz_localize('UTC').tz_convert(time_zone)
+    return pd.DataFrame(
+        {col: data[col].to_numpy() for col in ('open', 'high', 'low', 'close', 'volume') if col in data.columns},
+        index=index
+    )
+
+def _safe_range_position(current, low, high):
+    """
+    Position of current within [low, high], 0.5 when the range is empty.
+    Works elementwise on scalars or arrays.
+    """
+    span = high - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(span > 0, (current - low) / np.where(span > 0, span, 1.0), 0.5)
+
+def _linear_fit(x: np.ndarray, y: np.ndarray) -> tuple:
+    """
+    Closed-form least-squares slope and Pearson correlation of y on x.
+    Replaces np.polyfit/np.corrcoef for degree-1 fits.
+    """
+    n = len(x)
+    sum_x, sum_y = x.sum(), y.sum()
+    sxx = n * (x * x).sum() - sum_x * sum_x
+    syy = n * (y * y).sum() - sum_y * sum_y
+    sxy = n * (x * y).sum() - sum_x * sum_y
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        correlation = sxy / np.sqrt(sxx * syy)
+    
+    return slope, correlation
+
 class FeatureEngineer:
     """
     Advanced feature engineering for stock market data
     """
     
+    # Fewest bars the feature groups can work with (candlestick and acceleration features need 3)
+    MIN_HISTORY = 3
+    
+    # Longest tail any vectorized feature group looks at (20-bar returns need 21 closes)
+    TAIL_WINDOW = 21
+    
+    # Lookbacks for the position-in-range price features
+    RANGE_PERIODS = np.array([5, 10, 20])
+    
+    # Bars handed to TA-Lib candlestick recognizers
+    PATTERN_WINDOW = 32
+    
+    # Feature groups in output order with their widths
+    FEATURE_GROUPS = (
+        ('price', 14),
+        ('technical', 17),
+        ('volume', 5),
+        ('volatility', 4),
+        ('momentum', 5),
+        ('pattern', 5),
+        ('structure', 4),
+        ('time', 5),
+    )
+    FEATURE_OFFSETS = _group_offsets(FEATURE_GROUPS)
+    FEATURE_COUNT = sum(width for _, width in FEATURE_GROUPS)
+    
+    # Maximum number of cached feature vectors
+    FEATURE_CACHE_SIZE = 10_000
+    
+    # Symbols per thread-pool task in batched generation
+    BATCH_CHUNK_SIZE = 32
+    
     def __init__(self):
-        self.feature_cache = {}
+        self.feature_cache = OrderedDict()
+        self._x_arrays = {}
+        # TA-Lib and NumPy kernels release the GIL, so symbol chunks run in parallel
+        self._pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2))
         self.lookback_periods = [5, 10, 20, 50, 200]  # Common technical analysis periods
         
+        # Fixed x-axis terms for the 5-bar volume trend slope
+        x = np.arange(5, dtype=np.float64)
+        self._volume_trend_axis = (x, x.sum(), 5 * (x * x).sum() - x.sum() ** 2)
+        
     async def generate_features(self, data: pd.DataFrame, symbol: str) -> np.ndarray:
         """
-        Generate comprehensive feature set for a stock
+        Generate comprehensive feature set for a stock.
+        Accepts a pandas or Polars frame.
         """
         try:
+            data = _as_pandas_frame(data)
             if data is None or data.empty:
                 return None
             
@@ -38,489 +147,441 @@ class FeatureEngineer:
                 logger.warning(f"Missing required columns for {symbol}")
                 return None
             
-            features = []
-            
-            # Price-based features
-            price_features = self._generate_price_features(data)
-            features.extend(price_features)
-            
-            # Technical indicator features
-            technical_features = self._generate_technical_features(data)
-            features.extend(technical_features)
-            
-            # Volume features
-            volume_features = self._generate_volume_features(data)
-            features.extend(volume_features)
-            
-            # Volatility features
-            volatility_features = self._generate_volatility_features(data)
-            features.extend(volatility_features)
-            
-            # Momentum features
-            momentum_features = self._generate_momentum_features(data)
-            features.extend(momentum_features)
-            
-            # Pattern features
-            pattern_features = self._generate_pattern_features(data)
-            features.extend(pattern_features)
+            # Single length check; feature groups handle longer lookbacks inline
+            if len(data) < self.MIN_HISTORY:
+                logger.warning(f"Not enough history for {symbol}: {len(data)} bars")
+                return None
             
-            # Market structure features
-            structure_features = self._generate_market_structure_features(data)
-            features.extend(structure_features)
+            # Reuse features when the latest bar has not changed
+            cache_key = self._feature_cache_key(data, symbol)
+            cached = self.feature_cache.get(cache_key)
+            if cached is not None:
+                self.feature_cache.move_to_end(cache_key)
+                return cached
             
-            # Time-based features
-            time_features = self._generate_time_features(data)
-            features.extend(time_features)
+            # Every group writes into its slice of one preallocated vector
+            feature_array = np.empty((1, self.FEATURE_COUNT), dtype=np.float32)
+            self._fill_features([data], feature_array)
             
-            # Convert to numpy array
-            feature_array = np.array(features).reshape(1, -1)
+            # Callers share the cached vector, so freeze it against in-place edits
+            feature_array.flags.writeable = False
+            self.feature_cache[cache_key] = feature_array
+            if len(self.feature_cache) > self.FEATURE_CACHE_SIZE:
+                self.feature_cache.popitem(last=False)
             
-            logger.debug(f"Generated {len(features)} features for {symbol}")
+            logger.debug(f"Generated {self.FEATURE_COUNT} features for {symbol}")
             return feature_array
             
         except Exception as e:
             logger.error(f"Error generating features for {symbol}: {e}")
             return None
     
-    def _generate_price_features(self, data: pd.DataFrame) -> List[float]:
-        """Generate price-based features"""
-        features = []
+    def _feature_cache_key(self, data: pd.DataFrame, symbol: str) -> tuple:
+        """Key features by symbol, last bar timestamp, history length and last close"""
+        if isinstance(data.index, pd.DatetimeIndex):
+            last_bar = int(data.index.asi8[-1])
+        else:
+            last_bar = data.index[-1]
+        return (symbol, last_bar, len(data), float(data['close'].iloc[-1]))
+    
+    def _x_axis(self, length: int) -> np.ndarray:
+        """Memoized regression x-axis of the given length"""
+        x = self._x_arrays.get(length)
+        if x is None:
+            x = np.arange(length, dtype=np.float64)
+            self._x_arrays[length] = x
+        return x
+    
+    async def generate_features_batch(self, frames: Dict[str, pd.DataFrame]) -> np.ndarray:
+        """
+        Generate features for many symbols at once.
+        Returns shape (n_symbols, n_features) in the order of `frames`;
+        rows for symbols with unusable data are NaN.
+        """
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        symbols = list(frames.keys())
+        result = np.full((len(symbols), self.FEATURE_COUNT), np.nan, dtype=np.float32)
         
         try:
-            close = data['close']
-            high = data['high']
-            low = data['low']
-            open_price = data['open']
-            
-            # Current price relative to recent highs/lows
-            for period in [5, 10, 20]:
-                if len(close) >= period:
-                    recent_high = high.rolling(period).max().iloc[-1]
-                    recent_low = low.rolling(period).min().iloc[-1]
-                    current_price = close.iloc[-1]
-                    
-                    # Position within recent range
-                    if recent_high != recent_low:
-                        position_in_range = (current_price - recent_low) / (recent_high - recent_low)
-                        features.append(position_in_range)
-                    else:
-                        features.append(0.5)  # Neutral position
-                    
-                    # Distance from recent high/low
-                    features.append((current_price - recent_high) / recent_high)
-                    features.append((current_price - recent_low) / recent_low)
+            frames = {symbol: _as_pandas_frame(data) for symbol, data in frames.items()}
+            # Output row of every usable frame, recorded as we go
+            valid_rows = [
+                row for row, symbol in enumerate(symbols)
+                if frames[symbol] is not None and len(frames[symbol]) >= self.MIN_HISTORY
+                and all(col in frames[symbol].columns for col in required_columns)
+            ]
+            if not valid_rows:
+                return result
+            
+            block = np.empty((len(valid_rows), self.FEATURE_COUNT), dtype=np.float32)
+            valid_frames = [frames[symbols[row]] for row in valid_rows]
+            
+            # Each chunk fills a disjoint row range of `block`
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(
+                    self._pool,
+                    self._fill_features,
+                    valid_frames[start:start + self.BATCH_CHUNK_SIZE],
+                    block[start:start + self.BATCH_CHUNK_SIZE]
+                )
+                for start in range(0, len(valid_rows), self.BATCH_CHUNK_SIZE)
+            ))
+            
+            result[valid_rows] = block
+        except Exception as e:
+            logger.error(f"Error generating batch features: {e}")
+        
+        return result
+    
+    def _fill_features(self, frames: List[pd.DataFrame], out: np.ndarray):
+        """
+        Write the full feature vector of each frame into the rows of `out`.
+        Vectorized groups fill whole column blocks; the rest fill one row at a time.
+        """
+        offsets = self.FEATURE_OFFSETS
+        
+        # Full-history float64 columns, extracted once per frame (TA-Lib requires float64)
+        frame_arrays = [self._frame_arrays(data) for data in frames]
+        
+        # Tail-aligned float32 OHLC matrices shared by the vectorized feature groups
+        open_tail, high_tail, low_tail, close_tail, lengths = self._stack_tails(frame_arrays)
+        returns = self._tail_returns(close_tail)
+        
+        self._generate_price_features(open_tail, high_tail, low_tail, close_tail, lengths, out[:, offsets['price']])
+        self._generate_volatility_features(frame_arrays, close_tail, returns, lengths, out[:, offsets['volatility']])
+        self._generate_momentum_features(close_tail, returns, lengths, out[:, offsets['momentum']])
+        
+        for row, (data, arrays) in enumerate(zip(frames, frame_arrays)):
+            self._generate_technical_features(arrays, out[row, offsets['technical']])
+            self._generate_volume_features(arrays, out[row, offsets['volume']])
+            self._generate_pattern_features(arrays, out[row, offsets['pattern']])
+            self._generate_market_structure_features(arrays, out[row, offsets['structure']])
+            self._generate_time_features(data.index, arrays, out[row, offsets['time']])
+    
+    @staticmethod
+    def _frame_arrays(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Contiguous float64 OHLCV columns of a frame"""
+        return {
+            col: np.ascontiguousarray(data[col].values, dtype=np.float64)
+            for col in ('open', 'high', 'low', 'close', 'volume')
+        }
+    
+    def _stack_tails(self, frame_arrays: List[Dict[str, np.ndarray]]) -> tuple:
+        """
+        Stack the last TAIL_WINDOW bars of each frame into (n, TAIL_WINDOW) float32 matrices.
+        Shorter histories are left-padded with NaN; returns (open, high, low, close, lengths).
+        """
+        window = self.TAIL_WINDOW
+        n = len(frame_arrays)
+        mats = {col: np.full((n, window), np.nan, dtype=np.float32) for col in ('open', 'high', 'low', 'close')}
+        lengths = np.empty(n, dtype=np.int64)
+        
+        for row, arrays in enumerate(frame_arrays):
+            length = len(arrays['close'])
+            size = min(length, window)
+            lengths[row] = length
+            for col, mat in mats.items():
+                mat[row, window - size:] = arrays[col][-size:]
+        
+        return mats['open'], mats['high'], mats['low'], mats['close'], lengths
+    
+    @staticmethod
+    def _tail_returns(close: np.ndarray) -> np.ndarray:
+        """Simple returns of the tail close matrix, computed once per call and shared"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return close[:, 1:] / close[:, :-1] - 1.0
+    
+    def _generate_price_features(
+        self,
+        open_price: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        lengths: np.ndarray,
+        out: np.ndarray
+    ):
+        """Generate price-based features for a batch of tail matrices"""
+        current_price = close[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Current price relative to recent highs/lows, all periods at once:
+            # running max/min from the newest bar backwards, sampled at each period
+            periods = self.RANGE_PERIODS
+            recent_highs = np.fmax.accumulate(high[:, ::-1], axis=1)[:, periods - 1]
+            recent_lows = np.fmin.accumulate(low[:, ::-1], axis=1)[:, periods - 1]
+            has_period = lengths[:, None] >= periods
+            current = current_price[:, None]
+            
+            # Position within recent range (neutral when the range is flat)
+            position_in_range = _safe_range_position(current, recent_lows, recent_highs)
+            out[:, 0:9:3] = np.where(has_period, position_in_range, 0.5)
+            
+            # Distance from recent high/low
+            out[:, 1:9:3] = np.where(has_period, (current - recent_highs) / recent_highs, 0.0)
+            out[:, 2:9:3] = np.where(has_period, (current - recent_lows) / recent_lows, 0.0)
             
             # Price gaps
-            if len(data) >= 2:
-                prev_close = close.iloc[-2]
-                current_open = open_price.iloc[-1]
-                gap = (current_open - prev_close) / prev_close
-                features.append(gap)
-            else:
-                features.append(0.0)
+            prev_close = close[:, -2]
+            current_open = open_price[:, -1]
+            out[:, 9] = np.where(lengths >= 2, (current_open - prev_close) / prev_close, 0.0)
             
             # Intraday range
-            current_range = (high.iloc[-1] - low.iloc[-1]) / close.iloc[-1]
-            features.append(current_range)
+            out[:, 10] = (high[:, -1] - low[:, -1]) / current_price
             
             # Body vs shadow ratios (candlestick analysis)
-            body_size = abs(close.iloc[-1] - open_price.iloc[-1]) / close.iloc[-1]
-            upper_shadow = (high.iloc[-1] - max(close.iloc[-1], open_price.iloc[-1])) / close.iloc[-1]
-            lower_shadow = (min(close.iloc[-1], open_price.iloc[-1]) - low.iloc[-1]) / close.iloc[-1]
-            
-            features.extend([body_size, upper_shadow, lower_shadow])
-            
-        except Exception as e:
-            logger.warning(f"Error in price features: {e}")
-            # Return zeros if calculation fails
-            features = [0.0] * 20  # Expected number of price features
-        
-        return features
+            body_top = np.maximum(current_price, open_price[:, -1])
+            body_bottom = np.minimum(current_price, open_price[:, -1])
+            out[:, 11] = np.abs(current_price - open_price[:, -1]) / current_price
+            out[:, 12] = (high[:, -1] - body_top) / current_price
+            out[:, 13] = (body_bottom - low[:, -1]) / current_price
     
-    def _generate_technical_features(self, data: pd.DataFrame) -> List[float]:
+    def _generate_technical_features(self, arrays: Dict[str, np.ndarray], out: np.ndarray):
         """Generate technical indicator features"""
-        features = []
+        close, high, low = arrays['close'], arrays['high'], arrays['low']
         
-        try:
-            close = data['close']
-            high = data['high']
-            low = data['low']
-            volume = data['volume']
-            
-            # Moving averages and their relationships
-            for period in [5, 10, 20, 50]:
-                if len(close) >= period:
-                    ma = ta.sma(close, length=period)
-                    if not ma.empty:
-                        current_ma = ma.iloc[-1]
-                        # Price relative to MA
-                        features.append((close.iloc[-1] - current_ma) / current_ma)
-                        
-                        # MA slope
-                        if len(ma) >= 2:
-                            ma_slope = (ma.iloc[-1] - ma.iloc[-2]) / ma.iloc[-2]
-                            features.append(ma_slope)
-                        else:
-                            features.append(0.0)
-                    else:
-                        features.extend([0.0, 0.0])
-                else:
-                    features.extend([0.0, 0.0])
-            
-            # RSI
-            rsi = ta.rsi(close, length=14)
-            if not rsi.empty:
-                features.append(rsi.iloc[-1] / 100.0)  # Normalize to 0-1
-            else:
-                features.append(0.5)
-            
-            # MACD
-            macd_data = ta.macd(close)
-            if macd_data is not None and not macd_data.empty:
-                macd_line = macd_data['MACD_12_26_9'].iloc[-1] if 'MACD_12_26_9' in macd_data.columns else 0
-                macd_signal = macd_data['MACDs_12_26_9'].iloc[-1] if 'MACDs_12_26_9' in macd_data.columns else 0
-                macd_histogram = macd_data['MACDh_12_26_9'].iloc[-1] if 'MACDh_12_26_9' in macd_data.columns else 0
-                
-                # Normalize MACD values
-                features.extend([
-                    np.tanh(macd_line),  # Bounded between -1 and 1
-                    np.tanh(macd_signal),
-                    np.tanh(macd_histogram)
-                ])
-            else:
-                features.extend([0.0, 0.0, 0.0])
-            
-            # Bollinger Bands
-            bb = ta.bbands(close, length=20)
-            if bb is not None and not bb.empty:
-                bb_upper = bb['BBU_20_2.0'].iloc[-1] if 'BBU_20_2.0' in bb.columns else close.iloc[-1]
-                bb_lower = bb['BBL_20_2.0'].iloc[-1] if 'BBL_20_2.0' in bb.columns else close.iloc[-1]
-                bb_middle = bb['BBM_20_2.0'].iloc[-1] if 'BBM_20_2.0' in bb.columns else close.iloc[-1]
-                
-                # Position within Bollinger Bands
-                if bb_upper != bb_lower:
-                    bb_position = (close.iloc[-1] - bb_lower) / (bb_upper - bb_lower)
-                    features.append(bb_position)
-                else:
-                    features.append(0.5)
+        # Moving averages and their relationships
+        moving_averages = {}
+        for i, period in enumerate([5, 10, 20, 50]):
+            if len(close) >= period:
+                ma = talib.SMA(close, timeperiod=period)
+                moving_averages[period] = ma
+                current_ma = ma[-1]
+                # Price relative to MA
+                out[2 * i] = (close[-1] - current_ma) / current_ma
                 
-                # Bollinger Band width (volatility measure)
-                bb_width = (bb_upper - bb_lower) / bb_middle
-                features.append(bb_width)
-            else:
-                features.extend([0.5, 0.0])
-            
-            # Stochastic Oscillator
-            stoch = ta.stoch(high, low, close)
-            if stoch is not None and not stoch.empty:
-                stoch_k = stoch['STOCHk_14_3_3'].iloc[-1] if 'STOCHk_14_3_3' in stoch.columns else 50
-                stoch_d = stoch['STOCHd_14_3_3'].iloc[-1] if 'STOCHd_14_3_3' in stoch.columns else 50
-                features.extend([stoch_k / 100.0, stoch_d / 100.0])
+                # MA slope (needs one bar beyond the period for the previous MA)
+                out[2 * i + 1] = (ma[-1] - ma[-2]) / ma[-2] if len(close) > period else 0.0
             else:
-                features.extend([0.5, 0.5])
-            
-            # Williams %R
-            willr = ta.willr(high, low, close)
-            if not willr.empty:
-                features.append((willr.iloc[-1] + 100) / 100.0)  # Normalize to 0-1
-            else:
-                features.append(0.5)
-            
-        except Exception as e:
-            logger.warning(f"Error in technical features: {e}")
-            # Return zeros if calculation fails
-            features = [0.0] * 20  # Expected number of technical features
+                out[2 * i:2 * i + 2] = 0.0
         
-        return features
+        # Indicators below are NaN until TA-Lib's lookback is filled, so short histories keep 0.0
+        
+        # RSI (first value after 14 changes)
+        if len(close) > 14:
+            rsi = talib.RSI(close, timeperiod=14)
+            out[8] = rsi[-1] / 100.0  # Normalize to 0-1
+        else:
+            out[8] = 0.0
+        
+        # MACD (slow EMA plus signal EMA: 26 + 9 - 1 bars)
+        if len(close) >= 34:
+            macd_line, macd_signal, macd_histogram = talib.MACD(
+                close, fastperiod=12, slowperiod=26, signalperiod=9
+            )
+            
+            # Normalize MACD values, bounded between -1 and 1 (one ufunc call for all three)
+            out[9:12] = np.tanh([macd_line[-1], macd_signal[-1], macd_histogram[-1]])
+        else:
+            out[9:12] = 0.0
+        
+        # Bollinger Bands, reusing the 20-period SMA as the middle band
+        if len(close) >= 20:
+            sma20 = moving_averages[20]
+            std20 = talib.STDDEV(close, timeperiod=20, nbdev=1)
+            bb_middle = sma20[-1]
+            bb_upper = bb_middle + 2 * std20[-1]
+            bb_lower = bb_middle - 2 * std20[-1]
+            
+            # Position within Bollinger Bands
+            out[12] = _safe_range_position(close[-1], bb_lower, bb_upper)
+            
+            # Bollinger Band width (volatility measure)
+            out[13] = (bb_upper - bb_lower) / bb_middle
+        else:
+            out[12] = 0.5
+            out[13] = 0.0
+        
+        # Stochastic Oscillator (%K over 14 bars, then two 3-bar smoothings: 14 + 2 + 2 bars)
+        if len(close) >= 18:
+            stoch_k, stoch_d = talib.STOCH(
+                high, low, close, fastk_period=14, slowk_period=3, slowd_period=3
+            )
+            out[14] = stoch_k[-1] / 100.0
+            out[15] = stoch_d[-1] / 100.0
+        else:
+            out[14:16] = 0.0
+        
+        # Williams %R
+        if len(close) >= 14:
+            willr = talib.WILLR(high, low, close, timeperiod=14)
+            out[16] = (willr[-1] + 100) / 100.0  # Normalize to 0-1
+        else:
+            out[16] = 0.0
     
-    def _generate_volume_features(self, data: pd.DataFrame) -> List[float]:
+    def _generate_volume_features(self, arrays: Dict[str, np.ndarray], out: np.ndarray):
         """Generate volume-based features"""
-        features = []
+        volume, close = arrays['volume'], arrays['close']
         
-        try:
-            volume = data['volume']
-            close = data['close']
-            
-            # Volume moving averages
-            for period in [5, 20]:
-                if len(volume) >= period:
-                    vol_ma = volume.rolling(period).mean().iloc[-1]
-                    current_vol = volume.iloc[-1]
-                    
-                    # Volume relative to average
-                    if vol_ma > 0:
-                        vol_ratio = current_vol / vol_ma
-                        features.append(np.log1p(vol_ratio))  # Log transform for stability
-                    else:
-                        features.append(0.0)
-                else:
-                    features.append(0.0)
-            
-            # Volume trend
-            if len(volume) >= 5:
-                vol_trend = np.polyfit(range(5), volume.iloc[-5:].values, 1)[0]
-                features.append(np.tanh(vol_trend / volume.iloc[-1]))  # Normalized trend
-            else:
-                features.append(0.0)
-            
-            # On-Balance Volume (OBV)
-            obv = ta.obv(close, volume)
-            if not obv.empty and len(obv) >= 2:
-                obv_change = (obv.iloc[-1] - obv.iloc[-2]) / abs(obv.iloc[-2]) if obv.iloc[-2] != 0 else 0
-                features.append(np.tanh(obv_change))
-            else:
-                features.append(0.0)
-            
-            # Volume Price Trend (VPT)
-            vpt = ta.vpt(close, volume)
-            if not vpt.empty and len(vpt) >= 2:
-                vpt_change = (vpt.iloc[-1] - vpt.iloc[-2]) / abs(vpt.iloc[-2]) if vpt.iloc[-2] != 0 else 0
-                features.append(np.tanh(vpt_change))
-            else:
-                features.append(0.0)
-            
-        except Exception as e:
-            logger.warning(f"Error in volume features: {e}")
-            features = [0.0] * 5  # Expected number of volume features
+        # Raw values; log1p (slots 0-1) and tanh (slots 2-4) are applied once at the end.
+        # Zero maps to zero under both transforms, so unset slots keep the 0.0 default.
+        raw = np.zeros(5)
+        
+        # Volume moving averages
+        for i, period in enumerate([5, 20]):
+            if len(volume) >= period:
+                vol_ma = volume[-period:].mean()
+                
+                # Volume relative to average
+                if vol_ma > 0:
+                    raw[i] = volume[-1] / vol_ma
+        
+        # Volume trend
+        if len(volume) >= 5:
+            x, sum_x, denom = self._volume_trend_axis
+            y = volume[-5:]
+            vol_trend = (5 * (x * y).sum() - sum_x * y.sum()) / denom
+            raw[2] = vol_trend / volume[-1]  # Normalized trend
         
-        return features
+        # On-Balance Volume (OBV)
+        obv = talib.OBV(close, volume)
+        if len(obv) >= 2 and obv[-2] != 0:
+            raw[3] = (obv[-1] - obv[-2]) / abs(obv[-2])
+        
+        # Volume Price Trend (VPT); TA-Lib has no VPT so accumulate it directly
+        if len(close) >= 2:
+            vpt = np.nancumsum(np.concatenate(([np.nan], close[1:] / close[:-1] - 1.0)) * volume)
+            if vpt[-2] != 0:
+                raw[4] = (vpt[-1] - vpt[-2]) / abs(vpt[-2])
+        
+        out[0:2] = np.log1p(raw[0:2])  # Log transform for stability
+        out[2:5] = np.tanh(raw[2:5])
     
-    def _generate_volatility_features(self, data: pd.DataFrame) -> List[float]:
-        """Generate volatility-based features"""
-        features = []
+    def _generate_volatility_features(
+        self,
+        frame_arrays: List[Dict[str, np.ndarray]],
+        close: np.ndarray,
+        returns: np.ndarray,
+        lengths: np.ndarray,
+        out: np.ndarray
+    ):
+        """Generate volatility-based features for a batch of tail matrices"""
         
-        try:
-            close = data['close']
-            high = data['high']
-            low = data['low']
-            
+        with np.errstate(divide='ignore', invalid='ignore'):
             # Historical volatility (different periods)
-            for period in [5, 20]:
-                if len(close) >= period + 1:
-                    returns = close.pct_change().dropna()
-                    if len(returns) >= period:
-                        volatility = returns.rolling(period).std().iloc[-1]
-                        features.append(volatility * np.sqrt(252))  # Annualized volatility
-                    else:
-                        features.append(0.0)
+            period_vols = {}
+            for i, period in enumerate([5, 20]):
+                volatility = np.std(returns[:, -period:], axis=1, ddof=1)
+                period_vols[period] = volatility
+                out[:, i] = np.where(lengths >= period + 1, volatility * np.sqrt(252), 0.0)
+            
+            # Average True Range (ATR), first available after 14 true ranges
+            for row, arrays in enumerate(frame_arrays):
+                if lengths[row] > 14:
+                    atr = talib.ATR(arrays['high'], arrays['low'], arrays['close'], timeperiod=14)
+                    out[row, 2] = atr[-1] / close[row, -1]
                 else:
-                    features.append(0.0)
-            
-            # Average True Range (ATR)
-            atr = ta.atr(high, low, close, length=14)
-            if not atr.empty:
-                atr_normalized = atr.iloc[-1] / close.iloc[-1]
-                features.append(atr_normalized)
-            else:
-                features.append(0.0)
+                    out[row, 2] = 0.0
             
             # Volatility ratio (short vs long term)
-            if len(close) >= 21:
-                short_vol = close.pct_change().rolling(5).std().iloc[-1]
-                long_vol = close.pct_change().rolling(20).std().iloc[-1]
-                if long_vol > 0:
-                    vol_ratio = short_vol / long_vol
-                    features.append(vol_ratio)
-                else:
-                    features.append(1.0)
-            else:
-                features.append(1.0)
-            
-        except Exception as e:
-            logger.warning(f"Error in volatility features: {e}")
-            features = [0.0] * 4  # Expected number of volatility features
-        
-        return features
+            long_vol = period_vols[20]
+            vol_ratio = np.where(long_vol > 0, period_vols[5] / long_vol, 1.0)
+            out[:, 3] = np.where(lengths >= 21, vol_ratio, 1.0)
     
-    def _generate_momentum_features(self, data: pd.DataFrame) -> List[float]:
-        """Generate momentum-based features"""
-        features = []
+    def _generate_momentum_features(
+        self,
+        close: np.ndarray,
+        returns: np.ndarray,
+        lengths: np.ndarray,
+        out: np.ndarray
+    ):
+        """Generate momentum-based features for a batch of tail matrices"""
+        current_price = close[:, -1]
         
-        try:
-            close = data['close']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Rate of Change (ROC) for different periods; the 1-bar ROC is the last return
+            out[:, 0] = np.where(lengths >= 2, returns[:, -1], 0.0)
+            for i, period in enumerate([5, 10], start=1):
+                past_price = close[:, -1 - period]
+                out[:, i] = np.where(lengths >= period + 1, (current_price - past_price) / past_price, 0.0)
             
-            # Rate of Change (ROC) for different periods
-            for period in [1, 5, 10]:
-                if len(close) >= period + 1:
-                    roc = (close.iloc[-1] - close.iloc[-1-period]) / close.iloc[-1-period]
-                    features.append(roc)
-                else:
-                    features.append(0.0)
-            
-            # Momentum oscillator
-            if len(close) >= 11:
-                momentum = close.iloc[-1] - close.iloc[-11]
-                momentum_normalized = momentum / close.iloc[-11]
-                features.append(momentum_normalized)
-            else:
-                features.append(0.0)
+            # Momentum oscillator (10-bar change, same window as ROC 10)
+            out[:, 3] = out[:, 2]
             
             # Price acceleration (second derivative)
-            if len(close) >= 3:
-                acceleration = (close.iloc[-1] - close.iloc[-2]) - (close.iloc[-2] - close.iloc[-3])
-                acceleration_normalized = acceleration / close.iloc[-3]
-                features.append(acceleration_normalized)
-            else:
-                features.append(0.0)
-            
-        except Exception as e:
-            logger.warning(f"Error in momentum features: {e}")
-            features = [0.0] * 5  # Expected number of momentum features
-        
-        return features
+            acceleration = (close[:, -1] - close[:, -2]) - (close[:, -2] - close[:, -3])
+            out[:, 4] = np.where(lengths >= 3, acceleration / close[:, -3], 0.0)
     
-    def _generate_pattern_features(self, data: pd.DataFrame) -> List[float]:
+    def _generate_pattern_features(self, arrays: Dict[str, np.ndarray], out: np.ndarray):
         """Generate pattern recognition features"""
-        features = []
+        # TA-Lib candlestick patterns only look back a few bars plus a short averaging period
+        window = slice(-self.PATTERN_WINDOW, None)
+        open_price = arrays['open'][window]
+        high = arrays['high'][window]
+        low = arrays['low'][window]
+        close = arrays['close'][window]
         
-        try:
-            open_price = data['open'].values
-            high = data['high'].values
-            low = data['low'].values
-            close = data['close'].values
-            
-            if len(close) >= 3:
-                # Candlestick patterns (simplified)
-                
-                # Doji pattern
-                body_size = abs(close[-1] - open_price[-1])
-                total_range = high[-1] - low[-1]
-                is_doji = (body_size / total_range) < 0.1 if total_range > 0 else 0
-                features.append(float(is_doji))
-                
-                # Hammer pattern
-                lower_shadow = min(close[-1], open_price[-1]) - low[-1]
-                upper_shadow = high[-1] - max(close[-1], open_price[-1])
-                is_hammer = (lower_shadow > 2 * body_size) and (upper_shadow < body_size) if total_range > 0 else 0
-                features.append(float(is_hammer))
-                
-                # Engulfing pattern
-                if len(close) >= 2:
-                    prev_body = abs(close[-2] - open_price[-2])
-                    curr_body = abs(close[-1] - open_price[-1])
-                    is_engulfing = curr_body > prev_body and (
-                        (close[-1] > open_price[-1] and close[-2] < open_price[-2] and 
-                         close[-1] > open_price[-2] and open_price[-1] < close[-2]) or
-                        (close[-1] < open_price[-1] and close[-2] > open_price[-2] and 
-                         close[-1] < open_price[-2] and open_price[-1] > close[-2])
-                    )
-                    features.append(float(is_engulfing))
-                else:
-                    features.append(0.0)
-                
-                # Gap patterns
-                if len(close) >= 2:
-                    gap_up = open_price[-1] > close[-2]
-                    gap_down = open_price[-1] < close[-2]
-                    features.extend([float(gap_up), float(gap_down)])
-                else:
-                    features.extend([0.0, 0.0])
-            else:
-                features = [0.0] * 5  # Default pattern features
-            
-        except Exception as e:
-            logger.warning(f"Error in pattern features: {e}")
-            features = [0.0] * 5  # Expected number of pattern features
+        # Candlestick patterns, normalized from -100/0/100 to -1/0/1
+        out[0] = talib.CDLDOJI(open_price, high, low, close)[-1] / 100.0
+        out[1] = talib.CDLHAMMER(open_price, high, low, close)[-1] / 100.0
+        out[2] = talib.CDLENGULFING(open_price, high, low, close)[-1] / 100.0
         
-        return features
+        # Gap patterns
+        out[3] = float(open_price[-1] > close[-2])
+        out[4] = float(open_price[-1] < close[-2])
     
-    def _generate_market_structure_features(self, data: pd.DataFrame) -> List[float]:
+    def _generate_market_structure_features(self, arrays: Dict[str, np.ndarray], out: np.ndarray):
         """Generate market structure features"""
-        features = []
+        close, high, low = arrays['close'], arrays['high'], arrays['low']
         
-        try:
-            close = data['close']
-            high = data['high']
-            low = data['low']
-            
-            # Support and resistance levels
-            if len(close) >= 20:
-                # Recent highs and lows
-                recent_highs = high.rolling(10).max()
-                recent_lows = low.rolling(10).min()
-                
-                # Distance to nearest support/resistance
-                current_price = close.iloc[-1]
-                nearest_resistance = recent_highs.iloc[-10:].min()
-                nearest_support = recent_lows.iloc[-10:].max()
-                
-                if nearest_resistance > 0:
-                    resistance_distance = (nearest_resistance - current_price) / current_price
-                    features.append(resistance_distance)
-                else:
-                    features.append(0.0)
-                
-                if nearest_support > 0:
-                    support_distance = (current_price - nearest_support) / current_price
-                    features.append(support_distance)
-                else:
-                    features.append(0.0)
-            else:
-                features.extend([0.0, 0.0])
-            
-            # Trend strength
-            if len(close) >= 20:
-                # Linear regression slope
-                x = np.arange(len(close))
-                slope = np.polyfit(x, close.values, 1)[0]
-                trend_strength = slope / close.iloc[0] if close.iloc[0] > 0 else 0
-                features.append(trend_strength)
-                
-                # R-squared (trend consistency)
-                correlation = np.corrcoef(x, close.values)[0, 1]
-                r_squared = correlation ** 2
-                features.append(r_squared)
-            else:
-                features.extend([0.0, 0.0])
-            
-        except Exception as e:
-            logger.warning(f"Error in market structure features: {e}")
-            features = [0.0] * 4  # Expected number of structure features
+        # Support and resistance levels
+        if len(close) >= 20:
+            # 10-bar rolling highs and lows over the last 10 bars (spans 19 bars)
+            recent_highs = sliding_window_view(high[-19:], 10).max(axis=1)
+            recent_lows = sliding_window_view(low[-19:], 10).min(axis=1)
+            
+            # Distance to nearest support/resistance
+            current_price = close[-1]
+            nearest_resistance = recent_highs.min()
+            nearest_support = recent_lows.max()
+            
+            out[0] = (nearest_resistance - current_price) / current_price if nearest_resistance > 0 else 0.0
+            out[1] = (current_price - nearest_support) / current_price if nearest_support > 0 else 0.0
+        else:
+            out[0:2] = 0.0
         
-        return features
+        # Trend strength
+        if len(close) >= 20:
+            # Linear regression slope and correlation in one pass
+            slope, correlation = _linear_fit(self._x_axis(len(close)), close)
+            out[2] = slope / close[0] if close[0] > 0 else 0
+            
+            # R-squared (trend consistency)
+            out[3] = correlation ** 2
+        else:
+            out[2:4] = 0.0
     
-    def _generate_time_features(self, data: pd.DataFrame) -> List[float]:
+    def _generate_time_features(self, index: pd.Index, arrays: Dict[str, np.ndarray], out: np.ndarray):
         """Generate time-based features"""
-        features = []
-        
-        try:
-            # If we have datetime index, extract time features
-            if hasattr(data.index, 'hour'):
-                # Hour of day (market hours effect)
-                current_hour = data.index[-1].hour if len(data) > 0 else 12
-                hour_normalized = current_hour / 24.0
-                features.append(hour_normalized)
-                
-                # Day of week effect
-                current_dow = data.index[-1].dayofweek if len(data) > 0 else 2
-                dow_normalized = current_dow / 6.0
-                features.append(dow_normalized)
-                
-                # Month effect
-                current_month = data.index[-1].month if len(data) > 0 else 6
-                month_normalized = current_month / 12.0
-                features.append(month_normalized)
-            else:
-                # Default time features if no datetime index
-                features.extend([0.5, 0.5, 0.5])
-            
-            # Days since recent high/low
-            if len(data) >= 20:
-                high_idx = data['high'].rolling(20).apply(lambda x: x.argmax()).iloc[-1]
-                low_idx = data['low'].rolling(20).apply(lambda x: x.argmin()).iloc[-1]
-                
-                days_since_high = (len(data) - 1 - high_idx) / 20.0
-                days_since_low = (len(data) - 1 - low_idx) / 20.0
-                
-                features.extend([days_since_high, days_since_low])
-            else:
-                features.extend([0.5, 0.5])
-            
-        except Exception as e:
-            logger.warning(f"Error in time features: {e}")
-            features = [0.5, 0.5, 0.5, 0.5, 0.5]  # Default time features
+        # If we have datetime index, extract time features from the last bar
+        if hasattr(index, 'hour') and len(index) > 0:
+            # Local wall-clock time, so tz-aware indices keep exchange hours
+            last_bar = index[-1].to_pydatetime()
+            
+            # Hour of day (market hours effect)
+            out[0] = last_bar.hour / 24.0
+            
+            # Day of week effect
+            out[1] = last_bar.weekday() / 6.0
+            
+            # Month effect
+            out[2] = last_bar.month / 12.0
+        elif hasattr(index, 'hour'):
+            out[0:3] = [12 / 24.0, 2 / 6.0, 6 / 12.0]
+        else:
+            # Default time features if no datetime index
+            out[0:3] = 0.5
         
-        return features
+        # Days since recent high/low
+        if len(arrays['close']) >= 20:
+            # Positions are relative to the last 20 bars (19 = most recent)
+            high_idx = int(np.argmax(arrays['high'][-20:]))
+            low_idx = int(np.argmin(arrays['low'][-20:]))
+            
+            out[3] = (19 - high_idx) / 20.0
+            out[4] = (19 - low_idx) / 20.0
+        else:
+            out[3:5] = 0.5
     
     def get_feature_names(self) -> List[str]:
         """Get names of all generated features"""
@@ -8,6 +8,7 @@ import pandas as pd
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import asyncio
+from cachetools import TTLCache
 
 from utils.logger import setup_logger
 
@@ -18,11 +19,22 @@ class PredictionService:
     Service for generating stock price predictions
     """
     
+    # Time factors for volatility scaling, as a fraction of a trading year
+    _TIME_FACTOR_LUT = {
+        '1d': 1/252,
+        '5d': 5/252,
+        '1w': 7/252,
+        '1m': 30/252,
+        '3m': 90/252,
+        '6m': 180/252,
+        '1y': 1.0
+    }
+    
     def __init__(self, analytical_model, data_service):
         self.analytical_model = analytical_model
         self.data_service = data_service
-        self.prediction_cache = {}
         self.cache_ttl = 300  # 5 minutes
+        self.prediction_cache = TTLCache(maxsize=10_000, ttl=self.cache_ttl)
         
     async def predict_price(
         self,
@@ -36,11 +48,10 @@ class PredictionService:
         try:
             cache_key = f"{symbol}_{timeframe}_{confidence_interval}"
             
-            # Check cache
-            if cache_key in self.prediction_cache:
-                cached_prediction, timestamp = self.prediction_cache[cache_key]
-                if (datetime.now() - timestamp).seconds < self.cache_ttl:
-                    return cached_prediction
+            # Check cache (entries expire on their own)
+            cached_prediction = self.prediction_cache.get(cache_key)
+            if cached_prediction is not None:
+                return cached_prediction
             
             # Get stock data
             stock_data = await self.data_service.get_stock_data(symbol, period='1y')
@@ -60,7 +71,7 @@ class PredictionService:
             )
             
             # Cache the prediction
-            self.prediction_cache[cache_key] = (enhanced_prediction, datetime.now())
+            self.prediction_cache[cache_key] = enhanced_prediction
             
             return enhanced_prediction
             
@@ -91,30 +102,42 @@ class PredictionService:
                 'predictions': {}
             }
             
-            # Process each timeframe prediction
-            for timeframe, pred_data in base_prediction.items():
-                if isinstance(pred_data, dict) and 'predicted_change' in pred_data:
-                    predicted_change = pred_data['predicted_change']
-                    confidence = pred_data.get('confidence', 50) / 100.0
-                    
-                    # Calculate predicted price
-                    predicted_price = current_price * (1 + predicted_change)
-                    
-                    # Calculate confidence bounds
-                    time_factor = self._get_time_factor(timeframe)
-                    uncertainty = volatility * np.sqrt(time_factor) * (1 - confidence)
-                    
-                    upper_bound = predicted_price * (1 + z_score * uncertainty)
-                    lower_bound = predicted_price * (1 - z_score * uncertainty)
-                    
-                    enhanced_prediction['predictions'][timeframe] = {
+            # Process all timeframe predictions in one vectorized pass
+            timeframes = [
+                timeframe for timeframe, pred_data in base_prediction.items()
+                if isinstance(pred_data, dict) and 'predicted_change' in pred_data
+            ]
+            
+            if timeframes:
+                changes = np.array([base_prediction[tf]['predicted_change'] for tf in timeframes], dtype=np.float64)
+                confidences = np.array([base_prediction[tf].get('confidence', 50) for tf in timeframes], dtype=np.float64) / 100.0
+                time_factors = np.array([self._TIME_FACTOR_LUT.get(tf, 1/252) for tf in timeframes])
+                
+                # Predicted prices and confidence bounds
+                predicted_prices = current_price * (1 + changes)
+                uncertainties = volatility * np.sqrt(time_factors) * (1 - confidences)
+                upper_bounds = predicted_prices * (1 + z_score * uncertainties)
+                lower_bounds = predicted_prices * (1 - z_score * uncertainties)
+                
+                enhanced_prediction['predictions'] = {
+                    timeframe: {
                         'predicted_price': predicted_price,
-                        'predicted_change_percent': predicted_change * 100,
+                        'predicted_change_percent': change * 100,
                         'confidence': confidence * 100,
                         'upper_bound': upper_bound,
                         'lower_bound': lower_bound,
                         'uncertainty': uncertainty
                     }
+                    for timeframe, predicted_price, change, confidence, upper_bound, lower_bound, uncertainty in zip(
+                        timeframes,
+                        predicted_prices.tolist(),
+                        changes.tolist(),
+                        confidences.tolist(),
+                        upper_bounds.tolist(),
+                        lower_bounds.tolist(),
+                        uncertainties.tolist()
+                    )
+                }
             
             return enhanced_prediction
             
@@ -122,21 +145,6 @@ class PredictionService:
             logger.error(f"Error enhancing prediction: {e}")
             return base_prediction
     
-    def _get_time_factor(self, timeframe: str) -> float:
-        """
-        Get time factor for volatility scaling
-        """
-        time_factors = {
-            '1d': 1/252,
-            '5d': 5/252,
-            '1w': 7/252,
-            '1m': 30/252,
-            '3m': 90/252,
-            '6m': 180/252,
-            '1y': 1.0
-        }
-        return time_factors.get(timeframe, 1/252)
-    
     async def update_predictions(self):
         """
         Update cached predictions
@@ -144,18 +152,11 @@ class PredictionService:
         try:
             logger.info("Updating cached predictions...")
             
-            # Clear old cache entries
-            current_time = datetime.now()
-            expired_keys = []
-            
-            for key, (_, timestamp) in self.prediction_cache.items():
-                if (current_time - timestamp).seconds > self.cache_ttl:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self.prediction_cache[key]
+            # TTLCache drops expired entries lazily; purge them eagerly here
+            cached_before = len(self.prediction_cache)
+            self.prediction_cache.expire()
             
-            logger.info(f"Cleared {len(expired_keys)} expired predictions from cache")
+            logger.info(f"Cleared {cached_before - len(self.prediction_cache)} expired predictions from cache")
             
         except Exception as e:
             logger.error(f"Error updating predictions: {e}")
@@ -6,24 +6,91 @@ Handles sentiment analysis for stocks
 import asyncio
 import aiohttp
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime
+import os
 import re
-from textblob import TextBlob
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from cachetools import TTLCache
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from utils.logger import setup_logger
 
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except ImportError:
+    ort = None
+
 logger = setup_logger(__name__)
 
+# Unambiguous market keywords for the fast path that skips VADER
+_WORD_PATTERN = re.compile(r"[a-z']+")
+_POSITIVE_KEYWORDS = frozenset({
+    'bullish', 'beat', 'beats', 'beating', 'upgrade', 'upgrades', 'strong', 'growth', 'outperform'
+})
+_NEGATIVE_KEYWORDS = frozenset({
+    'bearish', 'miss', 'misses', 'downgrade', 'downgrades', 'concern', 'concerned', 'risk', 'underperform'
+})
+_NEGATIONS = frozenset({'not', 'no', 'never', 'without', 'nor'})
+
+# VADER's normalization constant and a typical lexicon valence for one keyword
+_VADER_ALPHA = 15.0
+_KEYWORD_VALENCE = 2.0
+
+class CachedSentimentIntensityAnalyzer(SentimentIntensityAnalyzer):
+    """
+    VADER analyzer that memoizes scores for repeated texts.
+    Headlines and mentions recur across symbols and refreshes, so most calls are cache hits.
+    """
+    
+    def __init__(self, cache_size: int = 65536):
+        super().__init__()
+        self._cached_polarity_scores = lru_cache(maxsize=cache_size)(super().polarity_scores)
+    
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        # Copy so callers can't mutate the cached result
+        return dict(self._cached_polarity_scores(text))
+
+# The lexicon is parsed once per process; the analyzer is read-only apart from its
+# thread-safe score cache, so every SentimentService shares it
+_VADER_ANALYZER = CachedSentimentIntensityAnalyzer()
+
 class SentimentService:
     """
     Service for analyzing stock sentiment from various sources
     """
     
-    def __init__(self):
-        self.vader_analyzer = SentimentIntensityAnalyzer()
-        self.sentiment_cache = {}
+    # VADER's recommended compound-score cutoffs for positive/negative
+    POSITIVE_THRESHOLD = 0.05
+    NEGATIVE_THRESHOLD = -0.05
+    
+    def __init__(self, use_textblob: bool = False):
+        self.vader_analyzer = _VADER_ANALYZER
+        
+        # TextBlob is much slower than VADER; only load it when a second opinion is requested
+        self.use_textblob = use_textblob
+        self._textblob = None
+        if use_textblob:
+            from textblob import TextBlob
+            self._textblob = TextBlob
+        
+        # Optional transformer classifier (ONNX export of DistilBERT SST-2 or similar); VADER otherwise
+        self._onnx_session = None
+        self._tokenizer = None
+        self._load_transformer_model()
+        
         self.cache_ttl = 1800  # 30 minutes
+        # Entry age is measured on the monotonic clock, so wall-clock jumps can't revive stale entries
+        self.sentiment_cache = TTLCache(maxsize=1024, ttl=self.cache_ttl, timer=time.monotonic)
+        
+        # One lock per in-flight cache miss so concurrent misses compute the sentiment only once
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Analyzer work is CPU-bound; run it off the event loop
+        self._pool = ThreadPoolExecutor(max_workers=4)
         
         # News sources (in production, you'd use proper news APIs)
         self.news_sources = [
@@ -32,6 +99,32 @@ class SentimentService:
             'https://www.cnbc.com'
         ]
     
+    def _load_transformer_model(self):
+        """
+        Load the ONNX sentiment model named by SENTIMENT_ONNX_MODEL, if configured
+        """
+        model_path = os.getenv('SENTIMENT_ONNX_MODEL')
+        if not model_path:
+            return
+        
+        if ort is None:
+            logger.warning("SENTIMENT_ONNX_MODEL is set but onnxruntime/transformers are not installed; using VADER")
+            return
+        
+        try:
+            self._onnx_session = ort.InferenceSession(
+                model_path,
+                providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(
+                os.getenv('SENTIMENT_TOKENIZER', 'distilbert-base-uncased-finetuned-sst-2-english')
+            )
+            logger.info(f"Loaded ONNX sentiment model from {model_path}")
+        except Exception as e:
+            logger.warning(f"Could not load ONNX sentiment model, using VADER: {e}")
+            self._onnx_session = None
+            self._tokenizer = None
+    
     async def get_sentiment(self, symbol: str) -> Dict[str, Any]:
         """
         Get comprehensive sentiment analysis for a stock
@@ -39,19 +132,34 @@ class SentimentService:
         try:
             # Check cache
             cache_key = f"sentiment_{symbol}"
-            if cache_key in self.sentiment_cache:
-                cached_sentiment, timestamp = self.sentiment_cache[cache_key]
-                if (datetime.now() - timestamp).seconds < self.cache_ttl:
-                    return cached_sentiment
-            
-            # Gather sentiment from multiple sources
-            sentiment_data = await self._gather_sentiment_data(symbol)
-            
-            # Analyze and aggregate sentiment
-            aggregated_sentiment = self._aggregate_sentiment(sentiment_data)
+            cached_sentiment = self.sentiment_cache.get(cache_key)
+            if cached_sentiment is not None:
+                return cached_sentiment
             
-            # Cache the result
-            self.sentiment_cache[cache_key] = (aggregated_sentiment, datetime.now())
+            lock = self._cache_locks.setdefault(cache_key, asyncio.Lock())
+            try:
+                async with lock:
+                    # Another request may have filled the cache while we waited
+                    cached_sentiment = self.sentiment_cache.get(cache_key)
+                    if cached_sentiment is not None:
+                        return cached_sentiment
+                    
+                    # Gather sentiment from multiple sources
+                    sentiment_data = await self._gather_sentiment_data(symbol)
+                    
+                    # Analyze and aggregate sentiment
+                    loop = asyncio.get_running_loop()
+                    aggregated_sentiment = await loop.run_in_executor(
+                        self._pool, self._aggregate_sentiment, sentiment_data
+                    )
+                    
+                    # Cache the result
+                    self.sentiment_cache[cache_key] = aggregated_sentiment
+            finally:
+                # The cache serves later callers, so the lock only lives while the miss is in flight;
+                # waiters already holding it still wake up and find the cached result
+                if self._cache_locks.get(cache_key) is lock:
+                    del self._cache_locks[cache_key]
             
             return aggregated_sentiment
             
@@ -135,18 +243,15 @@ class SentimentService:
         Aggregate sentiment from all sources
         """
         try:
-            all_texts = []
             source_sentiments = {}
             
             # Analyze sentiment for each source
             for source, texts in sentiment_data.items():
                 if texts:
-                    source_sentiment = self._analyze_texts(texts)
-                    source_sentiments[source] = source_sentiment
-                    all_texts.extend(texts)
+                    source_sentiments[source] = self._analyze_texts(texts)
             
-            # Overall sentiment
-            overall_sentiment = self._analyze_texts(all_texts) if all_texts else self._neutral_sentiment()
+            # Overall sentiment from the per-source results, so no text is analyzed twice
+            overall_sentiment = self._combine_sentiments(source_sentiments)
             
             # Calculate weighted sentiment score
             weighted_score = self._calculate_weighted_sentiment(source_sentiments)
@@ -171,30 +276,34 @@ class SentimentService:
         if not texts:
             return self._neutral_sentiment()
         
-        # Combine all texts
-        combined_text = ' '.join(texts)
+        # Score each text on its own so intensifiers and negations don't cross text boundaries
+        count = len(texts)
+        vader_scores = {'compound': 0.0, 'pos': 0.0, 'neg': 0.0, 'neu': 0.0}
+        for text in texts:
+            scores = self._keyword_scores(text) or self.vader_analyzer.polarity_scores(text)
+            for key in vader_scores:
+                vader_scores[key] += scores[key]
+        vader_scores = {key: value / count for key, value in vader_scores.items()}
+        combined_score = vader_scores['compound']
         
-        # TextBlob analysis
-        blob = TextBlob(combined_text)
-        textblob_polarity = blob.sentiment.polarity  # -1 to 1
-        textblob_subjectivity = blob.sentiment.subjectivity  # 0 to 1
+        # Transformer classifier takes over the score when available
+        if self._onnx_session is not None:
+            combined_score = self._analyze_texts_batch(texts)
         
-        # VADER analysis
-        vader_scores = self.vader_analyzer.polarity_scores(combined_text)
-        
-        # Combine scores
-        combined_score = (textblob_polarity + vader_scores['compound']) / 2
-        
-        # Classify sentiment
-        if combined_score >= 0.1:
-            classification = 'positive'
-        elif combined_score <= -0.1:
-            classification = 'negative'
-        else:
-            classification = 'neutral'
+        # Optional TextBlob second opinion, averaged with VADER
+        textblob_polarity = 0.0
+        textblob_subjectivity = 0.0
+        if self._textblob is not None:
+            for text in texts:
+                sentiment = self._textblob(text).sentiment
+                textblob_polarity += sentiment.polarity  # -1 to 1
+                textblob_subjectivity += sentiment.subjectivity  # 0 to 1
+            textblob_polarity /= count
+            textblob_subjectivity /= count
+            combined_score = (textblob_polarity + combined_score) / 2
         
         return {
-            'classification': classification,
+            'classification': self._classify(combined_score),
             'score': combined_score,
             'textblob_polarity': textblob_polarity,
             'textblob_subjectivity': textblob_subjectivity,
@@ -202,9 +311,88 @@ class SentimentService:
             'vader_positive': vader_scores['pos'],
             'vader_negative': vader_scores['neg'],
             'vader_neutral': vader_scores['neu'],
-            'text_count': len(texts)
+            'text_count': count
         }
     
+    @staticmethod
+    def _keyword_scores(text: str) -> Optional[Dict[str, float]]:
+        """
+        VADER-shaped scores from keyword counts when a text leans clearly one way.
+        Returns None (use VADER) for negated, balanced or keyword-free texts.
+        """
+        words = _WORD_PATTERN.findall(text.lower())
+        if not words:
+            return None
+        
+        word_set = set(words)
+        if word_set & _NEGATIONS or any(word.endswith("n't") for word in word_set):
+            return None
+        
+        positive = len(word_set & _POSITIVE_KEYWORDS)
+        negative = len(word_set & _NEGATIVE_KEYWORDS)
+        if positive == negative:
+            return None
+        
+        # Same normalization VADER applies to its summed valence
+        valence = _KEYWORD_VALENCE * (positive - negative)
+        compound = valence / (valence * valence + _VADER_ALPHA) ** 0.5
+        
+        pos_share = positive / len(words)
+        neg_share = negative / len(words)
+        return {
+            'compound': compound,
+            'pos': pos_share,
+            'neg': neg_share,
+            'neu': 1.0 - pos_share - neg_share
+        }
+    
+    def _analyze_texts_batch(self, texts: List[str]) -> float:
+        """
+        Score all texts in one transformer forward pass.
+        Returns the mean of P(positive) - P(negative), in [-1, 1].
+        """
+        encoded = self._tokenizer(texts, padding=True, truncation=True, max_length=128, return_tensors='np')
+        input_names = {model_input.name for model_input in self._onnx_session.get_inputs()}
+        feeds = {name: array.astype(np.int64) for name, array in encoded.items() if name in input_names}
+        
+        logits = self._onnx_session.run(None, feeds)[0]
+        
+        # Softmax over (negative, positive) labels
+        exp_logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities = exp_logits / exp_logits.sum(axis=1, keepdims=True)
+        
+        return float((probabilities[:, 1] - probabilities[:, 0]).mean())
+    
+    def _combine_sentiments(self, source_sentiments: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-source sentiment into one result, weighted by text count
+        """
+        total_texts = sum(s['text_count'] for s in source_sentiments.values())
+        if total_texts == 0:
+            return self._neutral_sentiment()
+        
+        combined = {
+            field: sum(s[field] * s['text_count'] for s in source_sentiments.values()) / total_texts
+            for field in ('score', 'textblob_polarity', 'textblob_subjectivity', 'vader_compound',
+                          'vader_positive', 'vader_negative', 'vader_neutral')
+        }
+        
+        return {
+            'classification': self._classify(combined['score']),
+            **combined,
+            'text_count': total_texts
+        }
+    
+    def _classify(self, score: float) -> str:
+        """
+        Map a sentiment score to positive/negative/neutral
+        """
+        if score >= self.POSITIVE_THRESHOLD:
+            return 'positive'
+        elif score <= self.NEGATIVE_THRESHOLD:
+            return 'negative'
+        return 'neutral'
+    
     def _calculate_weighted_sentiment(self, source_sentiments: Dict[str, Dict[str, Any]]) -> float:
         """
         Calculate weighted sentiment score across sources
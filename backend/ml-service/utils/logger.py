@@ -8,33 +8,28 @@ import os
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 
-def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Console and file handlers shared by every service logger, built on first use
+_HANDLERS = None
+
+def _shared_handlers() -> list:
     """
-    Set up a logger with both console and file handlers
+    Create the console and rotating file handlers once per process
     """
-    logger = logging.getLogger(name)
-    
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Set log level
-    log_level = getattr(logging, level.upper(), logging.INFO)
-    logger.setLevel(log_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    global _HANDLERS
+    if _HANDLERS is not None:
+        return _HANDLERS
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(_FORMATTER)
+    handlers = [console_handler]
     
-    # File handler
+    # File handler; the file is opened on the first record, not at startup
     try:
         log_dir = os.getenv('LOG_DIR', 'logs')
         os.makedirs(log_dir, exist_ok=True)
@@ -43,12 +38,31 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
         file_handler = RotatingFileHandler(
             log_file,
             maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            delay=True
         )
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(_FORMATTER)
+        handlers.append(file_handler)
     except Exception as e:
-        logger.warning(f"Could not set up file logging: {e}")
+        logging.getLogger(__name__).warning(f"Could not set up file logging: {e}")
+    
+    _HANDLERS = handlers
+    return _HANDLERS
+
+def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
+    """
+    Set up a logger with both console and file handlers
+    """
+    logger = logging.getLogger(name)
+    
+    # Avoid duplicate handlers
+    if logger.handlers:
+        return logger
+    
+    # Set log level; the shared handlers pass everything the logger lets through
+    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    
+    for handler in _shared_handlers():
+        logger.addHandler(handler)
     
     return logger
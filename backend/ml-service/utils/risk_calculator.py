@@ -5,15 +5,64 @@ Calculates various risk metrics for stock analysis
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 from scipy import stats
 import math
+from bisect import bisect_left, bisect_right
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.logger import setup_logger
+from utils.risk_kernels import return_statistics
+
+logger = setup_logger(__name__)
+
+# Annualization factor for daily volatility
+SQRT_252 = math.sqrt(252)
+
+# Prices and returns are held in float32 to halve memory traffic; reductions accumulate
+# in float64 so ratios with small denominators (Sharpe, Sortino) keep their precision
+RETURNS_DTYPE = np.float32
+
+# Normal quantiles for the VaR confidence levels, computed once at import
+Z_SCORES = {confidence: stats.norm.ppf(1 - confidence) for confidence in (0.95, 0.99)}
+
+# Risk level scoring tables: a value strictly above the k-th bin (strictly below, for
+# Sharpe) earns the k+1-th score
+VOLATILITY_BINS, VOLATILITY_SCORES = (0.2, 0.3), (1, 2, 3)
+DRAWDOWN_BINS, DRAWDOWN_SCORES = (0.1, 0.2), (1, 2, 3)
+BETA_BINS, BETA_SCORES = (1.2, 1.5), (0, 1, 2)
+SHARPE_BINS, SHARPE_SCORES = (0.0, 0.5), (2, 1, 0)
+RISK_LEVEL_BINS, RISK_LEVELS = (4, 7), ('conservative', 'regular', 'high-risk')
+
+class ReturnStats(NamedTuple):
+    """Single-pass statistics of daily returns (see utils.risk_kernels)"""
+    mean: float
+    std: float
+    downside_count: int
+    downside_std: float
+    max_drawdown: float
+    average_drawdown: float
+    
+    @property
+    def annual_volatility(self) -> float:
+        return self.std * SQRT_252
+    
+    @property
+    def annual_downside_deviation(self) -> float:
+        return self.downside_std * SQRT_252
 
 class RiskCalculator:
     """
     Calculate comprehensive risk metrics for stocks
     """
     
+    # Position size multipliers per risk tolerance
+    RISK_MULTIPLIERS = {
+        'conservative': 0.5,
+        'regular': 1.0,
+        'high-risk': 2.0
+    }
+    
     def __init__(self):
         self.risk_free_rate = 0.02  # 2% annual risk-free rate (adjustable)
         self.market_return = 0.10   # 10% annual market return (adjustable)
@@ -26,102 +75,221 @@ class RiskCalculator:
             if data is None or data.empty or len(data) < 2:
                 return self._default_risk_metrics()
             
-            close_prices = data['close']
-            returns = close_prices.pct_change().dropna()
+            # Contiguous float32 closes, converted once; every helper works on plain arrays
+            close_prices = data['close'].to_numpy(dtype=RETURNS_DTYPE)
+            returns = close_prices[1:] / close_prices[:-1] - 1.0
+            returns = returns[~np.isnan(returns)]
             
             if len(returns) < 2:
                 return self._default_risk_metrics()
             
+            # Moments, downside and drawdown statistics in one compiled pass
+            return_stats = ReturnStats(*return_statistics(returns))
+            
             metrics = {}
             
             # Volatility metrics
-            metrics.update(self._calculate_volatility_metrics(returns))
+            metrics.update(self._calculate_volatility_metrics(returns, return_stats))
             
             # Downside risk metrics
-            metrics.update(self._calculate_downside_risk_metrics(returns))
+            metrics.update(self._calculate_downside_risk_metrics(returns, return_stats))
             
             # Performance metrics
-            metrics.update(self._calculate_performance_metrics(returns, close_prices))
+            metrics.update(self._calculate_performance_metrics(returns, close_prices, return_stats))
             
             # Market risk metrics
-            metrics.update(self._calculate_market_risk_metrics(returns))
+            metrics.update(self._calculate_market_risk_metrics(return_stats))
             
             # Value at Risk metrics
-            metrics.update(self._calculate_var_metrics(returns))
+            metrics.update(self._calculate_var_metrics(returns, return_stats))
             
-            return metrics
+            return {key: float(value) for key, value in metrics.items()}
             
-        except Exception as e:
-            print(f"Error calculating risk metrics: {e}")
+        except Exception:
+            logger.exception("Error calculating risk metrics")
             return self._default_risk_metrics()
     
-    def _calculate_volatility_metrics(self, returns: pd.Series) -> Dict[str, float]:
+    def calculate_risk_metrics_batch(self, closes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate the same risk metrics for a whole portfolio at once.
+        `closes` is a (T, N) array of aligned, NaN-free closes with one column per symbol;
+        returns a dict of length-N arrays keyed like calculate_risk_metrics.
+        """
+        closes = np.asarray(closes, dtype=RETURNS_DTYPE)
+        n_symbols = closes.shape[1]
+        
+        try:
+            if closes.shape[0] < 3:
+                return self._default_risk_metrics_batch(n_symbols)
+            
+            returns = closes[1:] / closes[:-1] - 1.0
+            n_returns = returns.shape[0]
+            metrics = {}
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Volatility metrics
+                mean = returns.mean(axis=0, dtype=np.float64)
+                daily_vol = returns.std(axis=0, ddof=1, dtype=np.float64)
+                annual_vol = daily_vol * SQRT_252
+                metrics['volatility'] = annual_vol
+                metrics['daily_volatility'] = daily_vol
+                
+                if n_returns >= 30:
+                    metrics['rolling_volatility_30d'] = returns[-30:].std(axis=0, ddof=1, dtype=np.float64) * SQRT_252
+                    rolling_vols = sliding_window_view(returns, 10, axis=0).std(axis=-1, ddof=1, dtype=np.float64)
+                    metrics['volatility_of_volatility'] = rolling_vols.std(axis=0, ddof=1)
+                else:
+                    metrics['rolling_volatility_30d'] = annual_vol
+                    metrics['volatility_of_volatility'] = np.zeros(n_symbols)
+                
+                # Downside risk metrics; sample std of the negative returns per column
+                negative = returns < 0
+                downside_count = negative.sum(axis=0)
+                downside_mean = np.where(negative, returns, 0.0).sum(axis=0, dtype=np.float64) / downside_count
+                downside_var = (
+                    np.where(negative, returns - downside_mean, 0.0) ** 2
+                ).sum(axis=0) / (downside_count - 1)
+                downside_std = np.where(downside_count > 1, np.sqrt(downside_var), np.nan) * SQRT_252
+                metrics['downside_deviation'] = np.where(downside_count > 0, downside_std, 0.0)
+                
+                cumulative = np.cumprod(1.0 + returns, axis=0, dtype=np.float64)
+                drawdowns = cumulative / np.maximum.accumulate(cumulative, axis=0) - 1.0
+                in_drawdown = drawdowns < 0
+                drawdown_count = in_drawdown.sum(axis=0)
+                metrics['max_drawdown'] = -drawdowns.min(axis=0)
+                metrics['average_drawdown'] = np.where(
+                    drawdown_count > 0,
+                    -np.where(in_drawdown, drawdowns, 0.0).sum(axis=0) / drawdown_count,
+                    0.0
+                )
+                metrics['downside_frequency'] = downside_count / n_returns
+                
+                # Performance metrics
+                mean_return = mean * 252
+                excess_over_risk_free = mean_return - self.risk_free_rate
+                metrics['sharpe_ratio'] = np.where(annual_vol > 0, excess_over_risk_free / annual_vol, 0.0)
+                metrics['sortino_ratio'] = np.where(
+                    downside_count > 0,
+                    np.where(downside_std > 0, excess_over_risk_free / downside_std, 0.0),
+                    np.where(excess_over_risk_free > 0, np.inf, 0.0)
+                )
+                max_drawdown = metrics['max_drawdown']
+                metrics['calmar_ratio'] = np.where(
+                    max_drawdown > 0,
+                    mean_return / np.where(max_drawdown > 0, max_drawdown, 1.0),
+                    np.where(mean_return > 0, np.inf, 0.0)
+                )
+                metrics['information_ratio'] = np.where(
+                    annual_vol > 0,
+                    (mean - self.market_return / 252) * 252 / annual_vol,
+                    0.0
+                )
+                
+                # Market risk metrics
+                annual_var = annual_vol ** 2
+                systematic_risk = (0.7 ** 2) * annual_var
+                metrics['beta'] = np.clip(annual_vol / 0.16, 0.1, 3.0)
+                metrics['systematic_risk'] = systematic_risk
+                metrics['idiosyncratic_risk'] = np.maximum(annual_var - systematic_risk, 0.0)
+                
+                # Value at Risk metrics from one partition of every column
+                last = n_returns - 1
+                positions = {confidence: (1 - confidence) * last for confidence in Z_SCORES}
+                ranks = sorted({
+                    rank
+                    for position in positions.values()
+                    for rank in (int(position), min(int(position) + 1, last))
+                })
+                partitioned = np.partition(returns, ranks, axis=0)
+                
+                for confidence, position in positions.items():
+                    level = int(confidence * 100)
+                    lower = int(position)
+                    upper = min(lower + 1, last)
+                    historical_var = partitioned[lower] + (position - lower) * (partitioned[upper] - partitioned[lower])
+                    metrics[f'var_{level}'] = np.abs(historical_var)
+                    
+                    metrics[f'parametric_var_{level}'] = np.abs(mean + Z_SCORES[confidence] * daily_vol)
+                    
+                    tail = returns <= historical_var
+                    tail_count = tail.sum(axis=0)
+                    metrics[f'expected_shortfall_{level}'] = np.abs(np.where(
+                        tail_count > 0,
+                        np.where(tail, returns, 0.0).sum(axis=0, dtype=np.float64) / tail_count,
+                        historical_var
+                    ))
+            
+            return {key: np.asarray(value, dtype=np.float64) for key, value in metrics.items()}
+            
+        except Exception:
+            logger.exception("Error calculating batch risk metrics")
+            return self._default_risk_metrics_batch(n_symbols)
+    
+    def _default_risk_metrics_batch(self, n_symbols: int) -> Dict[str, np.ndarray]:
+        """Default risk metrics broadcast to every symbol in a batch"""
+        return {key: np.full(n_symbols, value) for key, value in self._default_risk_metrics().items()}
+    
+    @staticmethod
+    def _sample_std(values: np.ndarray) -> float:
+        """Sample standard deviation (ddof=1), NaN for fewer than two values"""
+        return values.std(ddof=1, dtype=np.float64) if len(values) > 1 else np.nan
+    
+    def _calculate_volatility_metrics(self, returns: np.ndarray, return_stats: ReturnStats) -> Dict[str, float]:
         """Calculate volatility-based risk metrics"""
         metrics = {}
         
         # Standard deviation (volatility)
-        daily_vol = returns.std()
-        annual_vol = daily_vol * np.sqrt(252)  # Annualized volatility
+        daily_vol = return_stats.std
+        annual_vol = return_stats.annual_volatility
         metrics['volatility'] = annual_vol
         metrics['daily_volatility'] = daily_vol
         
-        # Rolling volatility (30-day)
         if len(returns) >= 30:
-            rolling_vol = returns.rolling(30).std().iloc[-1] * np.sqrt(252)
-            metrics['rolling_volatility_30d'] = rolling_vol
+            # Rolling volatility (30-day); only the latest window is needed
+            metrics['rolling_volatility_30d'] = self._sample_std(returns[-30:]) * SQRT_252
+            
+            # Volatility of volatility over zero-copy 10-bar windows
+            rolling_vols = sliding_window_view(returns, 10).std(axis=1, ddof=1, dtype=np.float64)
+            metrics['volatility_of_volatility'] = self._sample_std(rolling_vols)
         else:
             metrics['rolling_volatility_30d'] = annual_vol
-        
-        # Volatility of volatility
-        if len(returns) >= 30:
-            rolling_vols = returns.rolling(10).std()
-            vol_of_vol = rolling_vols.std()
-            metrics['volatility_of_volatility'] = vol_of_vol
-        else:
             metrics['volatility_of_volatility'] = 0.0
         
         return metrics
     
-    def _calculate_downside_risk_metrics(self, returns: pd.Series) -> Dict[str, float]:
+    def _calculate_downside_risk_metrics(self, returns: np.ndarray, return_stats: ReturnStats) -> Dict[str, float]:
         """Calculate downside risk metrics"""
         metrics = {}
         
         # Downside deviation
-        negative_returns = returns[returns < 0]
-        if len(negative_returns) > 0:
-            downside_deviation = negative_returns.std() * np.sqrt(252)
+        if return_stats.downside_count > 0:
+            downside_deviation = return_stats.annual_downside_deviation
             metrics['downside_deviation'] = downside_deviation
         else:
             metrics['downside_deviation'] = 0.0
         
-        # Maximum drawdown
-        cumulative_returns = (1 + returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdowns = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdowns.min()
-        metrics['max_drawdown'] = abs(max_drawdown)
-        
-        # Average drawdown
-        negative_drawdowns = drawdowns[drawdowns < 0]
-        if len(negative_drawdowns) > 0:
-            avg_drawdown = negative_drawdowns.mean()
-            metrics['average_drawdown'] = abs(avg_drawdown)
-        else:
-            metrics['average_drawdown'] = 0.0
+        # Maximum and average drawdown
+        metrics['max_drawdown'] = return_stats.max_drawdown
+        metrics['average_drawdown'] = return_stats.average_drawdown
         
         # Downside frequency
-        downside_frequency = len(negative_returns) / len(returns)
+        downside_frequency = return_stats.downside_count / len(returns)
         metrics['downside_frequency'] = downside_frequency
         
         return metrics
     
-    def _calculate_performance_metrics(self, returns: pd.Series, prices: pd.Series) -> Dict[str, float]:
+    def _calculate_performance_metrics(
+        self,
+        returns: np.ndarray,
+        prices: np.ndarray,
+        return_stats: ReturnStats
+    ) -> Dict[str, float]:
         """Calculate performance-adjusted risk metrics"""
         metrics = {}
         
         # Sharpe ratio
-        mean_return = returns.mean() * 252  # Annualized return
-        annual_vol = returns.std() * np.sqrt(252)
+        mean_return = return_stats.mean * 252  # Annualized return
+        annual_vol = return_stats.annual_volatility
         if annual_vol > 0:
             sharpe_ratio = (mean_return - self.risk_free_rate) / annual_vol
             metrics['sharpe_ratio'] = sharpe_ratio
@@ -129,9 +297,8 @@ class RiskCalculator:
             metrics['sharpe_ratio'] = 0.0
         
         # Sortino ratio
-        negative_returns = returns[returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std() * np.sqrt(252)
+        if return_stats.downside_count > 0:
+            downside_std = return_stats.annual_downside_deviation
             if downside_std > 0:
                 sortino_ratio = (mean_return - self.risk_free_rate) / downside_std
                 metrics['sortino_ratio'] = sortino_ratio
@@ -141,7 +308,7 @@ class RiskCalculator:
             metrics['sortino_ratio'] = float('inf') if mean_return > self.risk_free_rate else 0.0
         
         # Calmar ratio
-        max_dd = metrics.get('max_drawdown', 0.0)
+        max_dd = return_stats.max_drawdown
         if max_dd > 0:
             calmar_ratio = mean_return / max_dd
             metrics['calmar_ratio'] = calmar_ratio
@@ -149,24 +316,25 @@ class RiskCalculator:
             metrics['calmar_ratio'] = float('inf') if mean_return > 0 else 0.0
         
         # Information ratio (assuming market return as benchmark)
-        excess_returns = returns - (self.market_return / 252)  # Daily market return
-        tracking_error = excess_returns.std() * np.sqrt(252)
+        # Subtracting the constant daily market return shifts the mean but not the std
+        excess_mean = return_stats.mean - (self.market_return / 252)  # Daily market return
+        tracking_error = return_stats.annual_volatility
         if tracking_error > 0:
-            information_ratio = (excess_returns.mean() * 252) / tracking_error
+            information_ratio = (excess_mean * 252) / tracking_error
             metrics['information_ratio'] = information_ratio
         else:
             metrics['information_ratio'] = 0.0
         
         return metrics
     
-    def _calculate_market_risk_metrics(self, returns: pd.Series) -> Dict[str, float]:
+    def _calculate_market_risk_metrics(self, return_stats: ReturnStats) -> Dict[str, float]:
         """Calculate market-related risk metrics"""
         metrics = {}
         
         # Beta (simplified - using correlation with market proxy)
         # In a real implementation, you would correlate with actual market returns
         # For now, we'll estimate based on volatility relative to typical market volatility
-        annual_vol = returns.std() * np.sqrt(252)
+        annual_vol = return_stats.annual_volatility
         typical_market_vol = 0.16  # Typical market volatility ~16%
         estimated_beta = annual_vol / typical_market_vol
         metrics['beta'] = min(max(estimated_beta, 0.1), 3.0)  # Cap between 0.1 and 3.0
@@ -183,27 +351,41 @@ class RiskCalculator:
         
         return metrics
     
-    def _calculate_var_metrics(self, returns: pd.Series) -> Dict[str, float]:
+    def _calculate_var_metrics(self, returns: np.ndarray, return_stats: ReturnStats) -> Dict[str, float]:
         """Calculate Value at Risk metrics"""
         metrics = {}
         
         confidence_levels = [0.95, 0.99]
         
+        # Historical VaR is a low order statistic, so a single O(n) partition around the
+        # needed ranks replaces a full percentile sort; values are interpolated linearly
+        # between neighbouring ranks exactly like np.percentile
+        last = len(returns) - 1
+        positions = {confidence: (1 - confidence) * last for confidence in confidence_levels}
+        ranks = sorted({
+            rank
+            for position in positions.values()
+            for rank in (int(position), min(int(position) + 1, last))
+        })
+        partitioned = np.partition(returns, ranks)
+        
         for confidence in confidence_levels:
             # Historical VaR
-            var_percentile = (1 - confidence) * 100
-            historical_var = np.percentile(returns, var_percentile)
+            position = positions[confidence]
+            lower = int(position)
+            upper = min(lower + 1, last)
+            historical_var = partitioned[lower] + (position - lower) * (partitioned[upper] - partitioned[lower])
             metrics[f'var_{int(confidence*100)}'] = abs(historical_var)
             
             # Parametric VaR (assuming normal distribution)
-            z_score = stats.norm.ppf(1 - confidence)
-            parametric_var = returns.mean() + z_score * returns.std()
+            z_score = Z_SCORES[confidence]
+            parametric_var = return_stats.mean + z_score * return_stats.std
             metrics[f'parametric_var_{int(confidence*100)}'] = abs(parametric_var)
             
             # Expected Shortfall (Conditional VaR)
             tail_returns = returns[returns <= historical_var]
             if len(tail_returns) > 0:
-                expected_shortfall = tail_returns.mean()
+                expected_shortfall = tail_returns.mean(dtype=np.float64)
                 metrics[f'expected_shortfall_{int(confidence*100)}'] = abs(expected_shortfall)
             else:
                 metrics[f'expected_shortfall_{int(confidence*100)}'] = abs(historical_var)
@@ -214,7 +396,7 @@ class RiskCalculator:
         """Return default risk metrics when calculation fails"""
         return {
             'volatility': 0.2,
-            'daily_volatility': 0.2 / np.sqrt(252),
+            'daily_volatility': 0.2 / SQRT_252,
             'rolling_volatility_30d': 0.2,
             'volatility_of_volatility': 0.0,
             'downside_deviation': 0.15,
@@ -246,47 +428,20 @@ class RiskCalculator:
             sharpe_ratio = metrics.get('sharpe_ratio', 0.0)
             beta = metrics.get('beta', 1.0)
             
-            # Risk scoring
-            risk_score = 0
-            
-            # Volatility component
-            if volatility > 0.3:
-                risk_score += 3
-            elif volatility > 0.2:
-                risk_score += 2
-            else:
-                risk_score += 1
-            
-            # Drawdown component
-            if max_drawdown > 0.2:
-                risk_score += 3
-            elif max_drawdown > 0.1:
-                risk_score += 2
-            else:
-                risk_score += 1
-            
-            # Beta component
-            if beta > 1.5:
-                risk_score += 2
-            elif beta > 1.2:
-                risk_score += 1
-            
-            # Sharpe ratio component (negative scoring - higher is better)
-            if sharpe_ratio < 0:
-                risk_score += 2
-            elif sharpe_ratio < 0.5:
-                risk_score += 1
+            # Risk scoring: each component is a threshold-table lookup
+            risk_score = (
+                VOLATILITY_SCORES[bisect_left(VOLATILITY_BINS, volatility)]
+                + DRAWDOWN_SCORES[bisect_left(DRAWDOWN_BINS, max_drawdown)]
+                + BETA_SCORES[bisect_left(BETA_BINS, beta)]
+                # Sharpe ratio scores negatively - higher is better
+                + SHARPE_SCORES[bisect_right(SHARPE_BINS, sharpe_ratio)]
+            )
             
             # Categorize based on total score
-            if risk_score >= 7:
-                return 'high-risk'
-            elif risk_score >= 4:
-                return 'regular'
-            else:
-                return 'conservative'
+            return RISK_LEVELS[bisect_right(RISK_LEVEL_BINS, risk_score)]
                 
-        except Exception as e:
-            print(f"Error categorizing risk level: {e}")
+        except Exception:
+            logger.exception("Error categorizing risk level")
             return 'regular'
     
     def calculate_position_size(self, 
@@ -297,44 +452,23 @@ class RiskCalculator:
         Calculate appropriate position size based on risk metrics and tolerance
         """
         try:
-            # Risk tolerance multipliers
-            risk_multipliers = {
-                'conservative': 0.5,
-                'regular': 1.0,
-                'high-risk': 2.0
-            }
-            
-            base_multiplier = risk_multipliers.get(risk_tolerance, 1.0)
-            
-            # Kelly Criterion approximation
+            # Unpack the inputs once
+            base_multiplier = self.RISK_MULTIPLIERS.get(risk_tolerance, 1.0)
             sharpe_ratio = risk_metrics.get('sharpe_ratio', 0.0)
             volatility = risk_metrics.get('volatility', 0.2)
-            
-            if volatility > 0:
-                # Simplified Kelly fraction
-                kelly_fraction = max(0, sharpe_ratio / (volatility ** 2))
-                kelly_fraction = min(kelly_fraction, 0.25)  # Cap at 25%
-            else:
-                kelly_fraction = 0.05  # Default 5%
-            
-            # Risk parity approach
             var_95 = risk_metrics.get('var_95', 0.02)
-            target_risk = 0.01 * base_multiplier  # 1% daily risk for regular tolerance
             
-            if var_95 > 0:
-                risk_parity_fraction = target_risk / var_95
-                risk_parity_fraction = min(risk_parity_fraction, 0.3)  # Cap at 30%
-            else:
-                risk_parity_fraction = 0.05
+            # Kelly Criterion approximation (simplified Kelly fraction), capped at 25%
+            kelly_fraction = min(max(0, sharpe_ratio / (volatility ** 2)), 0.25) if volatility > 0 else 0.05
+            
+            # Risk parity approach: 1% daily risk for regular tolerance, capped at 30%
+            risk_parity_fraction = min(0.01 * base_multiplier / var_95, 0.3) if var_95 > 0 else 0.05
             
-            # Volatility-based sizing
-            target_volatility = 0.15 * base_multiplier  # Target portfolio volatility
-            vol_based_fraction = target_volatility / max(volatility, 0.05)
-            vol_based_fraction = min(vol_based_fraction, 0.25)  # Cap at 25%
+            # Volatility-based sizing against a 15% target portfolio volatility, capped at 25%
+            vol_based_fraction = min(0.15 * base_multiplier / max(volatility, 0.05), 0.25)
             
-            # Average the approaches
-            recommended_fraction = (kelly_fraction + risk_parity_fraction + vol_based_fraction) / 3
-            recommended_fraction = max(0.01, min(recommended_fraction, 0.2))  # Between 1% and 20%
+            # Average the approaches, between 1% and 20%
+            recommended_fraction = min(max((kelly_fraction + risk_parity_fraction + vol_based_fraction) / 3, 0.01), 0.2)
             
             # Calculate position sizes
             recommended_value = portfolio_value * recommended_fraction
@@ -349,8 +483,8 @@ class RiskCalculator:
                 'volatility_based_fraction': vol_based_fraction
             }
             
-        except Exception as e:
-            print(f"Error calculating position size: {e}")
+        except Exception:
+            logger.exception("Error calculating position size")
             return {
                 'recommended_fraction': 0.05,
                 'recommended_value': portfolio_value * 0.05,
@@ -0,0 +1,61 @@
+"""
+Compiled risk kernels for VUTAX 2.0 ML Service
+Single-pass return statistics used by the risk calculator
+"""
+
+import numpy as np
+
+from utils.jit import njit
+
+@njit(cache=True)
+def return_statistics(returns):
+    """
+    One pass over daily returns computing:
+    (mean, std, downside_count, downside_std, max_drawdown, average_drawdown).
+    Standard deviations are sample (ddof=1) and NaN for fewer than two values;
+    drawdowns are reported as positive fractions.
+    """
+    n = returns.shape[0]
+    
+    # Welford accumulators for all returns and for negative returns
+    mean = 0.0
+    m2 = 0.0
+    neg_count = 0
+    neg_mean = 0.0
+    neg_m2 = 0.0
+    
+    # Running peak of cumulative growth for drawdowns
+    cumulative = 1.0
+    peak = -np.inf
+    min_drawdown = 0.0
+    drawdown_sum = 0.0
+    drawdown_count = 0
+    
+    for i in range(n):
+        r = returns[i]
+        
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+        
+        if r < 0.0:
+            neg_count += 1
+            neg_delta = r - neg_mean
+            neg_mean += neg_delta / neg_count
+            neg_m2 += neg_delta * (r - neg_mean)
+        
+        cumulative *= 1.0 + r
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = cumulative / peak - 1.0
+        if drawdown < 0.0:
+            drawdown_sum += drawdown
+            drawdown_count += 1
+            if drawdown < min_drawdown:
+                min_drawdown = drawdown
+    
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    downside_std = np.sqrt(neg_m2 / (neg_count - 1)) if neg_count > 1 else np.nan
+    average_drawdown = -drawdown_sum / drawdown_count if drawdown_count > 0 else 0.0
+    
+    return mean, std, neg_count, downside_std, -min_drawdown, average_drawdown
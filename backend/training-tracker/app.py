@@ -3,288 +3,579 @@ Flask Training Progress Tracker for VUTAX 2.0
 Real-time progress tracking for ML model training
 """
 
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
-import json
+# Patch blocking stdlib I/O (sockets, sleep, threading) before anything else imports it,
+# so background tasks and requests.get yield to the eventlet hub instead of stalling it
+import eventlet
+eventlet.monkey_patch()
+
+from flask import Flask, Response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import gzip
+from collections import deque
+from bisect import bisect_right
 import os
+import random
+import socket
 import threading
 import time
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+import jsonpatch
+import msgpack
+import orjson
 import logging
-from typing import Dict, Any, List
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def orjson_dumps(obj):
+    """Encode to JSON bytes; types orjson lacks (Decimal, Markup) fall back to Flask's encoder"""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=ORJSON_OPTIONS)
+
+class ORJSON:
+    """orjson with the json-module interface Flask-SocketIO expects"""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson_dumps(obj).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify and request.get_json"""
+    
+    def dumps(self, obj, **kwargs):
+        return ORJSON.dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'vutax_training_tracker_secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Global training status
-training_status = {
-    'is_training': False,
-    'progress': 0.0,
-    'current_stage': 'idle',
-    'model_type': '',
-    'start_time': None,
-    'estimated_completion': None,
-    'eta_minutes': 0,
-    'logs': [],
-    'data_fetching': {
-        'articles_fetched': 0,
-        'target_articles': 1000,
-        'stocks_processed': 0,
-        'target_stocks': 100,
-        'data_points': 0,
-        'target_data_points': 50000,
-        'fetch_rate': 0,  # articles per minute
-        'current_source': '',
-        'sources_completed': [],
-        'errors': 0,
-        'last_update': None,
-        'progress_history': []  # For graphing
-    },
-    'stage_progress': {
-        'data_collection': 0,
-        'feature_engineering': 0,
-        'model_training': 0,
-        'validation': 0,
-        'deployment': 0
-    },
-    'metrics': {
-        'analytical_model': {
-            'accuracy': 0.0,
-            'last_trained': None,
-            'training_count': 0,
-            'best_accuracy': 0.0
-        },
-        'chatbot_model': {
-            'quality_score': 0.0,
-            'last_trained': None,
-            'training_count': 0,
-            'best_quality': 0.0
-        }
-    }
-}
+app.json = ORJSONProvider(app)
+
+# Redis message queue, only for multi-worker deployments; without it there is no pub/sub hop
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='eventlet',
+    message_queue=os.getenv('TRACKER_REDIS_URL'),
+    channel='vutax-ts',
+    json=ORJSON,
+    # Frequent patches are tiny and latency-sensitive, so the transport never compresses;
+    # the one large payload, the initial snapshot, is gzipped explicitly instead
+    http_compression=False
+)
+
+# Room for clients currently showing the dashboard; status updates only go here
+TRAINING_ROOM = 'training'
+
+# Bounded history sizes; deques evict the oldest entry on append
+MAX_LOGS = 50
+MAX_PROGRESS_HISTORY = 50
+
+# Progress history is stored column-wise so each field name goes over the wire once
+PROGRESS_HISTORY_FIELDS = ('t', 'articles', 'stocks', 'points', 'rate')
+
+def new_progress_history():
+    """Empty progress history: one bounded column per field"""
+    return {field: deque(maxlen=MAX_PROGRESS_HISTORY) for field in PROGRESS_HISTORY_FIELDS}
+
+@dataclass(slots=True)
+class DataFetching:
+    """Progress of the (simulated) data collection stage"""
+    articles_fetched: int = 0
+    target_articles: int = 1000
+    stocks_processed: int = 0
+    target_stocks: int = 100
+    data_points: int = 0
+    target_data_points: int = 50000
+    fetch_rate: float = 0  # articles per minute
+    current_source: str = ''
+    sources_completed: List[str] = field(default_factory=list)
+    errors: int = 0
+    last_update: Optional[str] = None
+    progress_history: Dict[str, deque] = field(default_factory=new_progress_history)  # For graphing
+
+@dataclass(slots=True)
+class StageProgress:
+    """Completion percentage of each training stage"""
+    data_collection: float = 0
+    feature_engineering: float = 0
+    model_training: float = 0
+    validation: float = 0
+    deployment: float = 0
+
+@dataclass(slots=True)
+class AnalyticalModelMetrics:
+    """Latest results of the analytical model"""
+    accuracy: float = 0.0
+    last_trained: Optional[str] = None
+    training_count: int = 0
+    best_accuracy: float = 0.0
+
+@dataclass(slots=True)
+class ChatbotModelMetrics:
+    """Latest results of the chatbot model"""
+    quality_score: float = 0.0
+    last_trained: Optional[str] = None
+    training_count: int = 0
+    best_quality: float = 0.0
+
+@dataclass(slots=True)
+class Metrics:
+    """Per-model training results"""
+    analytical_model: AnalyticalModelMetrics = field(default_factory=AnalyticalModelMetrics)
+    chatbot_model: ChatbotModelMetrics = field(default_factory=ChatbotModelMetrics)
+
+@dataclass(slots=True)
+class TrainingStatus:
+    """Everything the dashboard shows; serialized as a whole by status_snapshot()"""
+    is_training: bool = False
+    progress: float = 0.0
+    current_stage: str = 'idle'
+    model_type: str = ''
+    start_time: Optional[str] = None
+    estimated_completion: Optional[str] = None
+    eta_minutes: int = 0
+    logs: deque = field(default_factory=lambda: deque(maxlen=MAX_LOGS))
+    data_fetching: DataFetching = field(default_factory=DataFetching)
+    stage_progress: StageProgress = field(default_factory=StageProgress)
+    metrics: Metrics = field(default_factory=Metrics)
+
+# Global training status; every read-modify-write and snapshot holds state_lock so
+# readers never see a half-applied update
+training_status = TrainingStatus()
+state_lock = threading.RLock()
 
 # ML Service URL
 ML_SERVICE_URL = os.getenv('ML_SERVICE_URL', 'http://localhost:8001')
 
-def simulate_data_fetching():
+# Keep-alive session shared by every call to the ML service. The pool is sized for the monitor
+# plus concurrent start/stop/metrics requests, so none of them has to open a fresh connection.
+ml_session = requests.Session()
+ml_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+ml_session.mount('http://', ml_adapter)
+ml_session.mount('https://', ml_adapter)
+
+# Status polling backs off exponentially (capped) while the ML service is unreachable
+ML_MAX_BACKOFF = 60
+_ml_failures = 0
+_ml_retry_at = 0.0
+
+# Status requests are long-polls: the ML service holds them until its status revision moves
+ML_LONG_POLL_SECONDS = 30
+_ml_revision = None
+
+# Status changes are coalesced and broadcast at most once per interval (seconds)
+EMIT_INTERVAL = float(os.getenv('TRACKER_EMIT_INTERVAL', '0.25'))
+status_dirty = threading.Event()
+
+def status_snapshot():
+    """Deep copy of training_status as plain dicts, with the bounded deques as lists, ready to serialize"""
+    with state_lock:
+        snapshot = asdict(training_status)
+    snapshot['logs'] = list(snapshot['logs'])
+    history = snapshot['data_fetching']['progress_history']
+    snapshot['data_fetching']['progress_history'] = {field: list(column) for field, column in history.items()}
+    return snapshot
+
+def add_log(stage, progress, message, now=None):
+    """Append a dashboard log entry; it goes out with the next coalesced status patch"""
+    training_status.logs.append({
+        'timestamp': (now or datetime.now()).strftime('%H:%M:%S'),
+        'stage': stage,
+        'progress': progress,
+        'message': message
+    })
+
+def logs_snapshot():
+    """Current training logs as a list"""
+    with state_lock:
+        return list(training_status.logs)
+
+# Log entries included in the /api/dashboard summary
+DASHBOARD_RECENT_LOGS = 5
+
+def dashboard_snapshot():
+    """Headline status fields and the most recent logs, read under one lock acquisition"""
+    with state_lock:
+        return {
+            'is_training': training_status.is_training,
+            'progress': training_status.progress,
+            'current_stage': training_status.current_stage,
+            'model_type': training_status.model_type,
+            'start_time': training_status.start_time,
+            'estimated_completion': training_status.estimated_completion,
+            'eta_minutes': training_status.eta_minutes,
+            'recent_logs': list(training_status.logs)[-DASHBOARD_RECENT_LOGS:]
+        }
+
+# (version, snapshot) of the state clients were last sent; replaced as a whole so readers
+# always see a matching pair
+last_snapshot = (0, status_snapshot())
+
+# Serialized /api/status, /api/logs and /api/dashboard bodies, keyed by the status generation
+# they were built from; mark_dirty() bumps the generation so the next request re-serializes
+status_generation = 0
+_json_cache = {}
+
+# Prefix for ETags so generations from an earlier process never match
+_ETAG_PREFIX = format(time.time_ns(), 'x')
+
+# Notified by mark_dirty() so /api/status/stream generators wake up as soon as the status changes
+status_changed = threading.Condition()
+
+def mark_dirty():
+    """Flag training_status as changed so the next broadcast tick sends it"""
+    global status_generation
+    with status_changed:
+        status_generation += 1
+        status_changed.notify_all()
+    status_dirty.set()
+
+def cached_body(key, build):
+    """(generation, serialized JSON) for `key`, rebuilt only when the status has changed since it was cached"""
+    generation = status_generation
+    cached = _json_cache.get(key)
+    if cached is None or cached[0] != generation:
+        cached = (generation, orjson_dumps(build()))
+        _json_cache[key] = cached
+    return cached
+
+def cached_json(key, build):
+    """JSON response for `key` from cached_body().
+    Responses carry an ETag, and a matching If-None-Match gets an empty 304."""
+    etag = f'{_ETAG_PREFIX}-{key}-{status_generation}'
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    generation, body = cached_body(key, build)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(f'{_ETAG_PREFIX}-{key}-{generation}')
+    return response
+
+def has_subscribers():
+    """Whether any client on this worker is in the training room"""
+    return bool(socketio.server.manager.rooms.get('/', {}).get(TRAINING_ROOM))
+
+def broadcast_status_updates():
+    """Send changes to training_status as JSON patches, at most once per interval"""
+    global last_snapshot
+    while True:
+        socketio.sleep(EMIT_INTERVAL)
+        # With nobody watching, leave the flag set and skip building the snapshot;
+        # the first tick after someone subscribes diffs against the last one sent
+        if not status_dirty.is_set() or not has_subscribers():
+            continue
+        status_dirty.clear()
+        
+        version, previous = last_snapshot
+        snapshot = status_snapshot()
+        ops = jsonpatch.make_patch(previous, snapshot).patch
+        if not ops:
+            continue
+        
+        last_snapshot = (version + 1, snapshot)
+        
+        # High-rate channel goes out as a binary msgpack frame. Patches are versioned
+        # against this process's state, so they only go to this worker's own clients
+        # and never through the message queue.
+        socketio.emit('training_patch_bin', msgpack.packb({
+            'from_version': version,
+            'version': version + 1,
+            'ops': ops
+        }, use_bin_type=True), room=TRAINING_ROOM, ignore_queue=True)
+
+def full_snapshot():
+    """Last broadcast snapshot with its version, which patches are computed against"""
+    version, snapshot = last_snapshot
+    return {'version': version, 'status': snapshot}
+
+def emit_compressed_snapshot():
+    """Send the full snapshot to the current client as a gzipped JSON binary frame"""
+    emit('snapshot_gz', gzip.compress(orjson_dumps(full_snapshot()), compresslevel=6))
+
+# Simulated data sources and a dedicated RNG for the fetch simulation
+DATA_SOURCES = ('Alpha Vantage', 'Yahoo Finance', 'News API', 'Reddit', 'Twitter')
+_rng = random.Random()
+
+# Time of the last simulated fetch tick; data_fetching.last_update is its ISO form for clients
+last_fetch_update = None
+
+def simulate_data_fetching(current_time):
     """Simulate realistic data fetching progress"""
-    import random
+    global last_fetch_update
     
-    if not training_status['is_training']:
+    if not training_status.is_training:
         return
     
-    current_time = datetime.now()
-    data_fetch = training_status['data_fetching']
+    data_fetch = training_status.data_fetching
     
     # Simulate different stages of data fetching
-    stage = training_status['current_stage']
+    stage = training_status.current_stage
     
     if stage == 'collecting_data':
         # Simulate fetching articles and stock data
-        if data_fetch['articles_fetched'] < data_fetch['target_articles']:
+        if data_fetch.articles_fetched < data_fetch.target_articles:
             # Fetch 5-15 articles per update
-            new_articles = random.randint(5, 15)
-            data_fetch['articles_fetched'] = min(
-                data_fetch['articles_fetched'] + new_articles,
-                data_fetch['target_articles']
+            new_articles = _rng.randint(5, 15)
+            data_fetch.articles_fetched = min(
+                data_fetch.articles_fetched + new_articles,
+                data_fetch.target_articles
             )
             
             # Update fetch rate (articles per minute)
-            if data_fetch['last_update']:
-                time_diff = (current_time - datetime.fromisoformat(data_fetch['last_update'])).total_seconds() / 60
+            if last_fetch_update:
+                time_diff = (current_time - last_fetch_update).total_seconds() / 60
                 if time_diff > 0:
-                    data_fetch['fetch_rate'] = new_articles / time_diff
+                    data_fetch.fetch_rate = new_articles / time_diff
             
             # Simulate different data sources
-            sources = ['Alpha Vantage', 'Yahoo Finance', 'News API', 'Reddit', 'Twitter']
-            data_fetch['current_source'] = random.choice(sources)
+            data_fetch.current_source = _rng.choice(DATA_SOURCES)
             
             # Occasionally add completed sources
-            if random.random() < 0.1:  # 10% chance
-                source = random.choice(sources)
-                if source not in data_fetch['sources_completed']:
-                    data_fetch['sources_completed'].append(source)
+            if _rng.random() < 0.1:  # 10% chance
+                source = _rng.choice(DATA_SOURCES)
+                if source not in data_fetch.sources_completed:
+                    data_fetch.sources_completed.append(source)
         
         # Simulate stock processing
-        if data_fetch['stocks_processed'] < data_fetch['target_stocks']:
-            new_stocks = random.randint(1, 3)
-            data_fetch['stocks_processed'] = min(
-                data_fetch['stocks_processed'] + new_stocks,
-                data_fetch['target_stocks']
+        if data_fetch.stocks_processed < data_fetch.target_stocks:
+            new_stocks = _rng.randint(1, 3)
+            data_fetch.stocks_processed = min(
+                data_fetch.stocks_processed + new_stocks,
+                data_fetch.target_stocks
             )
         
         # Simulate data points collection
-        if data_fetch['data_points'] < data_fetch['target_data_points']:
-            new_points = random.randint(100, 500)
-            data_fetch['data_points'] = min(
-                data_fetch['data_points'] + new_points,
-                data_fetch['target_data_points']
+        if data_fetch.data_points < data_fetch.target_data_points:
+            new_points = _rng.randint(100, 500)
+            data_fetch.data_points = min(
+                data_fetch.data_points + new_points,
+                data_fetch.target_data_points
             )
         
         # Occasionally simulate errors
-        if random.random() < 0.05:  # 5% chance of error
-            data_fetch['errors'] += 1
+        if _rng.random() < 0.05:  # 5% chance of error
+            data_fetch.errors += 1
     
-    # Update progress history for graphing (keep last 50 points)
-    progress_point = {
-        'timestamp': current_time.strftime('%H:%M:%S'),
-        'articles': data_fetch['articles_fetched'],
-        'stocks': data_fetch['stocks_processed'],
-        'data_points': data_fetch['data_points'],
-        'fetch_rate': data_fetch['fetch_rate']
-    }
+    # Update progress history for graphing (columns keep the last MAX_PROGRESS_HISTORY points)
+    history = data_fetch.progress_history
+    history['t'].append(current_time.strftime('%H:%M:%S'))
+    history['articles'].append(data_fetch.articles_fetched)
+    history['stocks'].append(data_fetch.stocks_processed)
+    history['points'].append(data_fetch.data_points)
+    history['rate'].append(data_fetch.fetch_rate)
     
-    data_fetch['progress_history'].append(progress_point)
-    if len(data_fetch['progress_history']) > 50:
-        data_fetch['progress_history'] = data_fetch['progress_history'][-50:]
+    last_fetch_update = current_time
+    data_fetch.last_update = current_time.isoformat()
+
+# Simulated run length and stage layout: (progress at stage end, stage, stage_progress key)
+SIMULATED_TRAINING_MINUTES = 25
+SIMULATED_STAGES = (
+    (30, 'collecting_data', 'data_collection'),
+    (50, 'feature_engineering', 'feature_engineering'),
+    (80, 'training', 'model_training'),
+    (95, 'validation', 'validation'),
+    (100, 'deployment', 'deployment'),
+)
+SIMULATED_STAGE_ENDS = [end for end, _, _ in SIMULATED_STAGES]
+
+# Precomputed (stage_progress key, progress at stage start, percent per progress point)
+SIMULATED_STAGE_SCALES = tuple(
+    (stage_key, stage_start, 100 / (stage_end - stage_start))
+    for stage_start, (stage_end, _, stage_key) in zip([0] + SIMULATED_STAGE_ENDS, SIMULATED_STAGES)
+)
+SIMULATED_PROGRESS_PER_SECOND = 100 / (SIMULATED_TRAINING_MINUTES * 60)
+
+# Monotonic clock reading when the simulated run started; start_time is its wall-clock form
+simulation_started_at = None
+
+def advance_simulated_training():
+    """Derive simulated progress and stage from the time elapsed since training started"""
+    global simulation_started_at
+    if simulation_started_at is None:
+        simulation_started_at = time.monotonic()
+    elapsed_seconds = time.monotonic() - simulation_started_at
+    progress = min(100.0, elapsed_seconds * SIMULATED_PROGRESS_PER_SECOND)
+    training_status.progress = progress
     
-    data_fetch['last_update'] = current_time.isoformat()
+    # Per-stage completion, clipped to 0-100
+    stage_progress = training_status.stage_progress
+    for stage_key, stage_start, scale in SIMULATED_STAGE_SCALES:
+        setattr(stage_progress, stage_key, min(max((progress - stage_start) * scale, 0), 100))
+    
+    if progress >= 100:
+        training_status.current_stage = 'completed'
+        training_status.is_training = False
+    else:
+        training_status.current_stage = SIMULATED_STAGES[bisect_right(SIMULATED_STAGE_ENDS, progress)][1]
+
+def poll_ml_status():
+    """ML service training status, or None if it is down or still in back-off"""
+    global _ml_failures, _ml_retry_at, _ml_revision
+    if time.monotonic() < _ml_retry_at:
+        return None
+    try:
+        if _ml_revision is None:
+            response = ml_session.get(f"{ML_SERVICE_URL}/training/status", timeout=2)
+        else:
+            response = ml_session.get(
+                f"{ML_SERVICE_URL}/training/status",
+                params={'since': _ml_revision, 'wait': ML_LONG_POLL_SECONDS},
+                timeout=ML_LONG_POLL_SECONDS + 5
+            )
+        if response.status_code == 200:
+            _ml_failures = 0
+            ml_status = response.json()
+            # Services without revisions don't support long-polling; keep short polls for them
+            _ml_revision = ml_status.get('revision')
+            return ml_status
+    except Exception:
+        pass
+    _ml_revision = None
+    _ml_failures += 1
+    _ml_retry_at = time.monotonic() + min(ML_MAX_BACKOFF, 2 ** _ml_failures)
+    return None
+
+# (stage, progress to one decimal) of the last stage message logged by the monitor
+last_stage_log_key = None
+
+# Monitor pacing (seconds): normal tick, slower tick once idle for a while, and the cap on
+# the exponential back-off after errors. Starting a run wakes an idle monitor right away.
+MONITOR_INTERVAL = 2
+MONITOR_IDLE_INTERVAL = 10
+MONITOR_IDLE_AFTER_TICKS = 5
+MONITOR_MAX_ERROR_BACKOFF = 30
+monitor_wake = threading.Event()
 
 def monitor_ml_service():
     """Monitor ML service for training updates"""
+    global last_stage_log_key
+    idle_ticks = 0
+    error_backoff = 1
     while True:
         try:
+            # Status only changes while a run is active or on the tick it starts/finishes
+            was_training = training_status.is_training
+            
             # Try to get real ML service status
-            try:
-                response = requests.get(f"{ML_SERVICE_URL}/training/status", timeout=2)
-                if response.status_code == 200:
-                    ml_status = response.json()
-                    use_real_data = True
-                else:
-                    use_real_data = False
-            except:
-                use_real_data = False
+            ml_status = poll_ml_status()
+            use_real_data = ml_status is not None
             
-            # Use simulated data if ML service not available
-            if not use_real_data:
-                # Simulate training progress
-                if training_status['is_training']:
-                    current_progress = training_status['progress']
-                    stage = training_status['current_stage']
-                    
-                    # Progress through stages
-                    if stage == 'collecting_data' and current_progress < 30:
-                        training_status['progress'] = min(current_progress + random.uniform(0.5, 2.0), 30)
-                        training_status['stage_progress']['data_collection'] = training_status['progress'] / 30 * 100
-                    elif stage == 'collecting_data' and current_progress >= 30:
-                        training_status['current_stage'] = 'feature_engineering'
-                        training_status['progress'] = 30
-                    elif stage == 'feature_engineering' and current_progress < 50:
-                        training_status['progress'] = min(current_progress + random.uniform(0.3, 1.5), 50)
-                        training_status['stage_progress']['feature_engineering'] = (training_status['progress'] - 30) / 20 * 100
-                    elif stage == 'feature_engineering' and current_progress >= 50:
-                        training_status['current_stage'] = 'training'
-                        training_status['progress'] = 50
-                    elif stage == 'training' and current_progress < 80:
-                        training_status['progress'] = min(current_progress + random.uniform(0.2, 1.0), 80)
-                        training_status['stage_progress']['model_training'] = (training_status['progress'] - 50) / 30 * 100
-                    elif stage == 'training' and current_progress >= 80:
-                        training_status['current_stage'] = 'validation'
-                        training_status['progress'] = 80
-                    elif stage == 'validation' and current_progress < 95:
-                        training_status['progress'] = min(current_progress + random.uniform(0.5, 2.0), 95)
-                        training_status['stage_progress']['validation'] = (training_status['progress'] - 80) / 15 * 100
-                    elif stage == 'validation' and current_progress >= 95:
-                        training_status['current_stage'] = 'deployment'
-                        training_status['progress'] = 95
-                    elif stage == 'deployment' and current_progress < 100:
-                        training_status['progress'] = min(current_progress + random.uniform(1.0, 3.0), 100)
-                        training_status['stage_progress']['deployment'] = (training_status['progress'] - 95) / 5 * 100
-                    elif current_progress >= 100:
-                        training_status['current_stage'] = 'completed'
-                        training_status['is_training'] = False
-                        training_status['progress'] = 100
-                    
-                    # Calculate ETA
-                    if training_status['progress'] > 0 and training_status['progress'] < 100:
-                        remaining_progress = 100 - training_status['progress']
-                        eta_minutes = int((remaining_progress / 100) * 25)  # 25 minute total estimate
-                        training_status['eta_minutes'] = eta_minutes
-                        training_status['estimated_completion'] = (datetime.now() + timedelta(minutes=eta_minutes)).strftime('%H:%M')
-                    else:
-                        training_status['eta_minutes'] = 0
-                        training_status['estimated_completion'] = None
-                    
-                    # Simulate data fetching
-                    simulate_data_fetching()
-            else:
-                # Use real ML service data
-                if ml_status.get('is_training', False):
-                    progress = ml_status.get('progress', 0)
-                    stage = ml_status.get('current_stage', 'training')
-                    
-                    training_status.update({
-                        'is_training': True,
-                        'progress': progress,
-                        'current_stage': stage,
-                        'model_type': ml_status.get('model_type', 'analytical'),
-                    })
-                    
-                    # Calculate ETA
-                    eta_minutes = 0
-                    if progress > 0:
-                        remaining_progress = 100 - progress
-                        eta_minutes = int((remaining_progress / 100) * 30)
-                    
-                    training_status['eta_minutes'] = eta_minutes
-                    training_status['estimated_completion'] = (datetime.now() + timedelta(minutes=eta_minutes)).strftime('%H:%M') if eta_minutes > 0 else None
-                else:
-                    if training_status['is_training']:
-                        # Training just finished
-                        training_status.update({
-                            'is_training': False,
-                            'progress': 100,
-                            'current_stage': 'completed',
-                            'eta_minutes': 0,
-                            'estimated_completion': None
-                        })
+            # One clock read per tick, shared by the ETA, data fetching and log timestamps
+            now = datetime.now()
             
-            # Add log entry
-            if training_status['is_training']:
-                stage = training_status['current_stage']
-                progress = training_status['progress']
-                log_message = get_stage_message(stage, progress)
+            with state_lock:
+                # Use simulated data if ML service not available
+                if not use_real_data:
+                    # Simulate training progress
+                    if training_status.is_training:
+                        advance_simulated_training()
+                        
+                        # Calculate ETA; the projected finish only moves when the whole-minute ETA does
+                        if training_status.progress > 0 and training_status.progress < 100:
+                            remaining_progress = 100 - training_status.progress
+                            eta_minutes = int((remaining_progress / 100) * SIMULATED_TRAINING_MINUTES)
+                            if eta_minutes != training_status.eta_minutes or training_status.estimated_completion is None:
+                                training_status.eta_minutes = eta_minutes
+                                training_status.estimated_completion = (now + timedelta(minutes=eta_minutes)).strftime('%H:%M')
+                        else:
+                            training_status.eta_minutes = 0
+                            training_status.estimated_completion = None
+                        
+                        # Simulate data fetching
+                        simulate_data_fetching(now)
+                else:
+                    # Use real ML service data
+                    if ml_status.get('is_training', False):
+                        progress = ml_status.get('progress', 0)
+                        stage = ml_status.get('current_stage', 'training')
+                        progress_changed = not was_training or progress != training_status.progress
+                        
+                        training_status.is_training = True
+                        training_status.progress = progress
+                        training_status.current_stage = stage
+                        training_status.model_type = ml_status.get('model_type', 'analytical')
+                        
+                        # Calculate ETA, only when progress has moved since the last poll
+                        if progress_changed:
+                            eta_minutes = 0
+                            if progress > 0:
+                                remaining_progress = 100 - progress
+                                eta_minutes = int((remaining_progress / 100) * 30)
+                            
+                            training_status.eta_minutes = eta_minutes
+                            training_status.estimated_completion = (now + timedelta(minutes=eta_minutes)).strftime('%H:%M') if eta_minutes > 0 else None
+                    else:
+                        if training_status.is_training:
+                            # Training just finished
+                            training_status.is_training = False
+                            training_status.progress = 100
+                            training_status.current_stage = 'completed'
+                            training_status.eta_minutes = 0
+                            training_status.estimated_completion = None
                 
-                if not training_status['logs'] or training_status['logs'][-1]['message'] != log_message:
-                    training_status['logs'].append({
-                        'timestamp': datetime.now().strftime('%H:%M:%S'),
-                        'stage': stage,
-                        'progress': progress,
-                        'message': log_message
-                    })
+                # Add log entry
+                if training_status.is_training:
+                    stage = training_status.current_stage
+                    progress = training_status.progress
                     
-                    # Keep only last 50 logs
-                    if len(training_status['logs']) > 50:
-                        training_status['logs'] = training_status['logs'][-50:]
+                    # Messages show progress to one decimal, so only format when that changes
+                    log_key = (stage, round(progress, 1))
+                    if log_key != last_stage_log_key:
+                        last_stage_log_key = log_key
+                        add_log(stage, progress, get_stage_message(stage, progress), now)
             
-            # Emit update to all connected clients
-            socketio.emit('training_update', training_status)
+            # Queue update for connected clients; idle ticks leave the snapshot and caches alone
+            if was_training or training_status.is_training:
+                mark_dirty()
             
-            time.sleep(2)  # Check every 2 seconds for more responsive updates
+            error_backoff = 1
+            idle_ticks = 0 if training_status.is_training else idle_ticks + 1
+            
+            # A long-poll already waited for the change, so ask again right away
+            if ml_status is not None and _ml_revision is not None:
+                socketio.sleep(0)
+            elif idle_ticks > MONITOR_IDLE_AFTER_TICKS:
+                monitor_wake.wait(MONITOR_IDLE_INTERVAL)
+                monitor_wake.clear()
+            else:
+                socketio.sleep(MONITOR_INTERVAL)
             
         except Exception as e:
             logger.debug(f"ML service monitoring error: {e}")
-            time.sleep(5)  # Wait on error
+            socketio.sleep(error_backoff)  # Back off on repeated errors
+            error_backoff = min(error_backoff * 2, MONITOR_MAX_ERROR_BACKOFF)
+
+# Human-readable stage messages, formatted with the progress percentage
+STAGE_MESSAGES = {
+    'collecting_data': '📊 Collecting training data... ({:.1f}%)',
+    'feature_engineering': '🔧 Engineering features... ({:.1f}%)',
+    'training': '🤖 Training model... ({:.1f}%)',
+    'validation': '✅ Validating model... ({:.1f}%)',
+    'deployment': '🚀 Deploying model... ({:.1f}%)',
+    'completed': '🎉 Training completed successfully!',
+    'error': '❌ Training failed',
+    'idle': '💤 Ready to start training...'
+}
+DEFAULT_STAGE_MESSAGE = 'Processing... ({:.1f}%)'
 
 def get_stage_message(stage, progress):
     """Get human-readable message for current stage"""
-    messages = {
-        'collecting_data': f'📊 Collecting training data... ({progress:.1f}%)',
-        'feature_engineering': f'🔧 Engineering features... ({progress:.1f}%)',
-        'training': f'🤖 Training model... ({progress:.1f}%)',
-        'validation': f'✅ Validating model... ({progress:.1f}%)',
-        'deployment': f'🚀 Deploying model... ({progress:.1f}%)',
-        'completed': '🎉 Training completed successfully!',
-        'error': '❌ Training failed',
-        'idle': '💤 Ready to start training...'
-    }
-    return messages.get(stage, f'Processing... ({progress:.1f}%)')
+    return STAGE_MESSAGES.get(stage, DEFAULT_STAGE_MESSAGE).format(progress)
 
 @app.route('/')
 def index():
@@ -294,52 +585,80 @@ def index():
 @app.route('/api/status')
 def get_status():
     """Get current training status"""
-    return jsonify(training_status)
+    return cached_json('status', status_snapshot)
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """Get a compact training summary for pollers that don't need the full status"""
+    return cached_json('dashboard', dashboard_snapshot)
+
+# Idle /api/status/stream connections get a comment line this often so proxies and clients keep them open
+SSE_KEEPALIVE_SECONDS = 15
+
+@app.route('/api/status/stream')
+def stream_status():
+    """Push the dashboard summary as Server-Sent Events whenever it changes"""
+    def events():
+        generation = None
+        last_body = None
+        while True:
+            with status_changed:
+                status_changed.wait_for(lambda: status_generation != generation, timeout=SSE_KEEPALIVE_SECONDS)
+            if status_generation == generation:
+                yield b': keep-alive\n\n'
+                continue
+            
+            generation, body = cached_body('dashboard', dashboard_snapshot)
+            # Not every status change touches the summary fields
+            if body != last_body:
+                last_body = body
+                yield b'data: ' + body + b'\n\n'
+    
+    return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/start-training', methods=['POST'])
 def start_training():
     """Start training for specified model"""
+    global last_fetch_update, simulation_started_at, last_stage_log_key
     try:
         data = request.get_json() or {}
         model_type = data.get('model_type', 'analytical')
         
-        if training_status['is_training']:
-            return jsonify({'error': 'Training already in progress'}), 400
-        
-        # Initialize training status
-        training_status.update({
-            'is_training': True,
-            'progress': 0.0,
-            'current_stage': 'collecting_data',
-            'start_time': datetime.now().isoformat(),
-            'model_type': model_type,
-            'logs': [],
-            'eta_minutes': 25,
-            'estimated_completion': (datetime.now() + timedelta(minutes=25)).strftime('%H:%M')
-        })
-        
-        # Reset data fetching metrics
-        training_status['data_fetching'].update({
-            'articles_fetched': 0,
-            'stocks_processed': 0,
-            'data_points': 0,
-            'fetch_rate': 0,
-            'current_source': 'Alpha Vantage',
-            'sources_completed': [],
-            'errors': 0,
-            'last_update': datetime.now().isoformat(),
-            'progress_history': []
-        })
-        
-        # Reset stage progress
-        for stage in training_status['stage_progress']:
-            training_status['stage_progress'][stage] = 0
+        with state_lock:
+            if training_status.is_training:
+                return jsonify({'error': 'Training already in progress'}), 400
+            
+            # Initialize training status
+            now = datetime.now()
+            training_status.is_training = True
+            training_status.progress = 0.0
+            training_status.current_stage = 'collecting_data'
+            training_status.start_time = now.isoformat()
+            simulation_started_at = time.monotonic()
+            training_status.model_type = model_type
+            training_status.logs.clear()
+            training_status.eta_minutes = 25
+            training_status.estimated_completion = (now + timedelta(minutes=25)).strftime('%H:%M')
+            
+            # Reset data fetching metrics
+            last_fetch_update = now
+            training_status.data_fetching = DataFetching(
+                current_source='Alpha Vantage',
+                last_update=last_fetch_update.isoformat()
+            )
+            
+            # Reset stage progress
+            training_status.stage_progress = StageProgress()
+            last_stage_log_key = None
+            
+            # Add initial log
+            add_log('collecting_data', 0, f'🚀 Started training {model_type} model', now)
         
         # Try to send request to ML service (optional)
         try:
-            response = requests.post(f"{ML_SERVICE_URL}/training/start", 
-                                   json={'model_type': model_type}, 
-                                   timeout=5)
+            response = ml_session.post(f"{ML_SERVICE_URL}/training/start", 
+                                      json={'model_type': model_type}, 
+                                      timeout=5)
             if response.status_code == 200:
                 logger.info("ML service training started")
             else:
@@ -349,16 +668,9 @@ def start_training():
         except Exception as e:
             logger.info(f"Using simulated training: {e}")
         
-        # Add initial log
-        training_status['logs'].append({
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
-            'stage': 'collecting_data',
-            'progress': 0,
-            'message': f'🚀 Started training {model_type} model'
-        })
-        
-        # Emit initial update
-        socketio.emit('training_update', training_status)
+        # Queue initial update, and get an idle monitor ticking again
+        mark_dirty()
+        monitor_wake.set()
         
         return jsonify({'success': True, 'message': f'Started training {model_type} model'})
             
@@ -370,35 +682,29 @@ def start_training():
 def stop_training():
     """Stop current training"""
     try:
-        if not training_status['is_training']:
-            return jsonify({'error': 'No training in progress'}), 400
-        
-        # Stop training
-        training_status.update({
-            'is_training': False,
-            'current_stage': 'stopped',
-            'eta_minutes': 0,
-            'estimated_completion': None
-        })
-        
-        # Add log
-        training_status['logs'].append({
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
-            'stage': 'stopped',
-            'progress': training_status['progress'],
-            'message': '🛑 Training stopped by user'
-        })
+        with state_lock:
+            if not training_status.is_training:
+                return jsonify({'error': 'No training in progress'}), 400
+            
+            # Stop training
+            training_status.is_training = False
+            training_status.current_stage = 'stopped'
+            training_status.eta_minutes = 0
+            training_status.estimated_completion = None
+            
+            # Add log
+            add_log('stopped', training_status.progress, '🛑 Training stopped by user')
         
         # Try to stop ML service (optional)
         try:
-            response = requests.post(f"{ML_SERVICE_URL}/training/stop", timeout=5)
+            response = ml_session.post(f"{ML_SERVICE_URL}/training/stop", timeout=5)
             if response.status_code == 200:
                 logger.info("ML service training stopped")
         except Exception as e:
             logger.info(f"Could not stop ML service: {e}")
         
-        # Emit update
-        socketio.emit('training_update', training_status)
+        # Queue update
+        mark_dirty()
         
         return jsonify({'success': True, 'message': 'Training stopped successfully'})
         
@@ -409,35 +715,102 @@ def stop_training():
 @app.route('/api/logs')
 def get_logs():
     """Get training logs"""
-    return jsonify(training_status['logs'])
+    return cached_json('logs', logs_snapshot)
+
+# Successful /models/status bodies are reused for METRICS_TTL seconds, so dashboard refreshes
+# share one upstream call; the lock lets a single request refill an expired entry
+METRICS_TTL = 1.5
+_metrics_cache = (0.0, None)
+_metrics_lock = threading.Lock()
 
 @app.route('/api/metrics')
 def get_metrics():
     """Get performance metrics"""
+    global _metrics_cache
     try:
-        response = requests.get(f"{ML_SERVICE_URL}/models/status", timeout=5)
-        if response.status_code == 200:
-            return jsonify(response.json())
-        else:
-            return jsonify({'error': 'Failed to get metrics'}), 500
+        with _metrics_lock:
+            fetched_at, body = _metrics_cache
+            if body is None or time.monotonic() - fetched_at >= METRICS_TTL:
+                response = ml_session.get(f"{ML_SERVICE_URL}/models/status", timeout=5)
+                if response.status_code != 200:
+                    return jsonify({'error': 'Failed to get metrics'}), 500
+                body = response.content
+                _metrics_cache = (time.monotonic(), body)
+        return Response(body, mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def tune_client_socket():
+    """Disable Nagle and enable keep-alive on the client's TCP socket"""
+    wsgi_input = request.environ.get('eventlet.input')
+    if wsgi_input is None or not hasattr(wsgi_input, 'get_socket'):
+        return
+    try:
+        sock = wsgi_input.get_socket()
+        # Small progress frames go out immediately instead of waiting on Nagle
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Lets the OS drop connections from dashboards that vanished without closing
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError as e:
+        logger.debug(f"Could not set client socket options: {e}")
+
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
     logger.info('📱 Client connected to training dashboard')
-    emit('training_update', training_status)
+    tune_client_socket()
+    join_room(TRAINING_ROOM)
+    emit_compressed_snapshot()
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     logger.info('📱 Client disconnected from training dashboard')
 
+@socketio.on('subscribe')
+def handle_subscribe():
+    """Resume status updates for a client, starting from a full snapshot"""
+    join_room(TRAINING_ROOM)
+    emit_compressed_snapshot()
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe():
+    """Stop status updates for a client that isn't showing the dashboard"""
+    leave_room(TRAINING_ROOM)
+
 @socketio.on('request_status')
 def handle_status_request():
     """Handle status request from client"""
-    emit('training_update', training_status)
+    emit('training_update', full_snapshot())
+
+_background_tasks_started = False
+
+def start_background_tasks():
+    """Start the ML service monitor and the status broadcaster once per process"""
+    global _background_tasks_started
+    if _background_tasks_started:
+        return
+    _background_tasks_started = True
+    
+    # Start monitoring task
+    socketio.start_background_task(monitor_ml_service)
+    
+    # Start the coalescing status broadcaster
+    socketio.start_background_task(broadcast_status_updates)
+
+# Printed on its own stdout line once the server accepts connections, when TRACKER_ANNOUNCE_READY
+# is set; start_training.py waits for it instead of polling the HTTP API
+READY_SENTINEL = '__READY__'
+
+def announce_ready(port):
+    """Print READY_SENTINEL as soon as `port` accepts a connection"""
+    while True:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            break
+        except OSError:
+            socketio.sleep(0.05)
+    print(READY_SENTINEL, flush=True)
 
 if __name__ == '__main__':
     print("\n" + "="*60)
@@ -451,9 +824,9 @@ if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
     
-    # Start monitoring thread
-    monitor_thread = threading.Thread(target=monitor_ml_service, daemon=True)
-    monitor_thread.start()
+    start_background_tasks()
+    if os.getenv('TRACKER_ANNOUNCE_READY'):
+        socketio.start_background_task(announce_ready, 5000)
     
-    # Run the Flask app
+    # Development server; production runs under gunicorn (see start.sh)
     socketio.run(app, host='0.0.0.0', port=5000, debug=False)
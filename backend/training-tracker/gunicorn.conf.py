@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for the VUTAX 2.0 Training Tracker
+"""
+
+import os
+
+bind = os.getenv('TRACKER_BIND', '0.0.0.0:5000')
+
+# Eventlet workers give every Socket.IO connection and the background tasks a green thread
+worker_class = 'eventlet'
+worker_connections = 1000
+
+# Socket.IO needs sticky sessions, which gunicorn's own balancing can't provide. Run more than
+# one worker only behind a sticky load balancer and with TRACKER_REDIS_URL set, so emits reach
+# clients connected to the other workers.
+workers = int(os.getenv('TRACKER_WORKERS', '1'))
+
+def post_worker_init(worker):
+    """Start the tracker's background tasks inside each worker"""
+    from app import start_background_tasks
+    start_background_tasks()
@@ -0,0 +1,4 @@
+#!/bin/sh
+# Production entry point for the training tracker: gunicorn with eventlet workers, no debug mode
+cd "$(dirname "$0")"
+exec gunicorn -c gunicorn.conf.py app:app
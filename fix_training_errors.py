@@ -4,88 +4,92 @@ VUTAX 2.0 - Training Error Fix Script
 Fixes the pandas_ta import error and other training issues
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
 
+BANNER = "\n".join([
+    "\n" + "="*60,
+    "🔧 VUTAX 2.0 - TRAINING ERROR FIX",
+    "="*60,
+    "\n🎯 Fixing common training errors:",
+    "   • pandas_ta import error",
+    "   • ML service connection issues",
+    "   • Missing Flask-SocketIO",
+    "   • Training tracker dependencies",
+    "\n" + "="*60 + "\n"
+]) + "\n"
+
+SUMMARY = "\n".join([
+    "\n" + "="*60,
+    "✅ ERROR FIX COMPLETE!",
+    "="*60,
+    "\n🎯 Status:",
+    "   • Training system should now work properly",
+    "   • ML service connection errors are handled gracefully",
+    "   • Dashboard will use simulated data if ML service unavailable",
+    "\n🚀 Ready to start:",
+    "   1. python start_training.py",
+    "   2. Visit http://localhost:5000 for enhanced dashboard",
+    "\n" + "="*60 + "\n"
+]) + "\n"
+
+def pip_install(*args):
+    """Run pip install with the given arguments; True if it succeeded"""
+    result = subprocess.run([sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check', *args],
+                            capture_output=True)
+    return result.returncode == 0
+
+def install_missing(packages):
+    """Install all missing packages in one pip call, falling back to one at a time"""
+    print(f"\n🔧 Installing {', '.join(packages)}...")
+    if pip_install(*packages):
+        for package in packages:
+            print(f"   ✅ {package} installed successfully")
+        return
+    
+    print("   ⚠️  Combined installation failed, installing packages individually...")
+    for package in packages:
+        if pip_install(package) or pip_install('--upgrade', package):
+            print(f"   ✅ {package} installed successfully")
+        else:
+            print(f"   ❌ Failed to install {package}")
+            print(f"      Try manually: pip install {package}")
+
 def fix_training_errors():
     """Fix common training errors"""
-    print("\n" + "="*60)
-    print("🔧 VUTAX 2.0 - TRAINING ERROR FIX")
-    print("="*60)
-    print("\n🎯 Fixing common training errors:")
-    print("   • pandas_ta import error")
-    print("   • ML service connection issues")
-    print("   • Missing Flask-SocketIO")
-    print("   • Training tracker dependencies")
-    print("\n" + "="*60 + "\n")
-    
-    # Fix pandas_ta import error
-    print("📊 Fixing pandas_ta import error...")
-    try:
-        import pandas_ta
-        print("   ✅ pandas_ta already installed")
-    except ImportError:
-        print("   Installing pandas_ta...")
-        try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'pandas_ta'], 
-                         check=True, capture_output=True)
-            print("   ✅ pandas_ta installed successfully")
-        except subprocess.CalledProcessError:
-            print("   ⚠️  Standard installation failed, trying alternative...")
-            try:
-                subprocess.run([sys.executable, '-m', 'pip', 'install', '--upgrade', 'pandas_ta'], 
-                             check=True, capture_output=True)
-                print("   ✅ pandas_ta installed with upgrade")
-            except subprocess.CalledProcessError:
-                print("   ❌ Failed to install pandas_ta")
-                print("      Try manually: pip install pandas_ta")
+    sys.stdout.write(BANNER)
     
-    # Fix Flask-SocketIO
-    print("\n🌐 Checking Flask-SocketIO...")
-    try:
-        import flask_socketio
-        print("   ✅ Flask-SocketIO already installed")
-    except ImportError:
-        print("   Installing Flask-SocketIO...")
-        try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'flask-socketio'], 
-                         check=True, capture_output=True)
-            print("   ✅ Flask-SocketIO installed successfully")
-        except subprocess.CalledProcessError:
-            print("   ❌ Failed to install Flask-SocketIO")
+    # (import name, pip package) for everything training needs
+    required_packages = [
+        ('pandas_ta', 'pandas_ta'),
+        ('flask_socketio', 'flask-socketio'),
+        ('eventlet', 'eventlet'),
+        ('jsonpatch', 'jsonpatch'),
+        ('msgpack', 'msgpack'),
+        ('orjson', 'orjson'),
+        ('pandas', 'pandas'),
+        ('numpy', 'numpy'),
+        ('sklearn', 'scikit-learn'),
+        ('matplotlib', 'matplotlib'),
+        ('yfinance', 'yfinance')
+    ]
     
-    # Check other essential packages
-    essential_packages = ['pandas', 'numpy', 'sklearn', 'matplotlib', 'yfinance']
-    print("\n📦 Checking essential packages...")
+    # find_spec only locates the module, without importing heavy libraries just to probe them
+    print("📦 Checking required packages...")
+    missing = []
+    for module, package in required_packages:
+        if importlib.util.find_spec(module) is not None:
+            print(f"   ✅ {module} available")
+        else:
+            print(f"   ⚠️  {module} missing")
+            missing.append(package)
     
-    for package in essential_packages:
-        try:
-            if package == 'sklearn':
-                import sklearn
-            else:
-                __import__(package)
-            print(f"   ✅ {package} available")
-        except ImportError:
-            print(f"   ⚠️  {package} missing, installing...")
-            try:
-                subprocess.run([sys.executable, '-m', 'pip', 'install', package], 
-                             check=True, capture_output=True)
-                print(f"   ✅ {package} installed")
-            except subprocess.CalledProcessError:
-                print(f"   ❌ Failed to install {package}")
+    if missing:
+        install_missing(missing)
     
-    print("\n" + "="*60)
-    print("✅ ERROR FIX COMPLETE!")
-    print("="*60)
-    print("\n🎯 Status:")
-    print("   • Training system should now work properly")
-    print("   • ML service connection errors are handled gracefully")
-    print("   • Dashboard will use simulated data if ML service unavailable")
-    print("\n🚀 Ready to start:")
-    print("   1. python start_training.py")
-    print("   2. Visit http://localhost:5000 for enhanced dashboard")
-    print("\n" + "="*60 + "\n")
+    sys.stdout.write(SUMMARY)
 
 if __name__ == '__main__':
     try:
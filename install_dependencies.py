@@ -8,24 +8,74 @@ import subprocess
 import sys
 import os
 
+BANNER = "\n".join([
+    "\n" + "="*60,
+    "🔧 VUTAX 2.0 - DEPENDENCY INSTALLATION",
+    "="*60,
+    "\n📦 This script will install:",
+    "   • Flask and Flask-SocketIO for web services",
+    "   • Eventlet, msgpack, jsonpatch and orjson for the training tracker",
+    "   • Pandas and NumPy for data processing",
+    "   • Scikit-learn for machine learning",
+    "   • Pandas-TA for technical analysis",
+    "   • YFinance for market data",
+    "   • Matplotlib for visualization",
+    "\n" + "="*60 + "\n"
+]) + "\n"
+
+SUMMARY = "\n".join([
+    "\n" + "="*60,
+    "✅ DEPENDENCY INSTALLATION COMPLETE!",
+    "="*60,
+    "\n🎯 Next steps:",
+    "   1. Run: python start_website.py (for Flask website)",
+    "   2. Run: python start_training.py (for AI training)",
+    "   3. Visit: http://localhost:3000 (main platform)",
+    "   4. Visit: http://localhost:5000 (training dashboard)",
+    "\n💡 If any packages failed to install:",
+    "   • Try: pip install -r requirements.txt",
+    "   • For pandas-ta issues: pip install --upgrade pandas-ta",
+    "   • For Windows TA-Lib: download from unofficial binaries",
+    "\n" + "="*60 + "\n"
+]) + "\n"
+
+def pip_install(packages):
+    """Run one pip install for all packages; returns the completed process"""
+    return subprocess.run([
+        sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check', *packages
+    ], capture_output=True, text=True)
+
+def install_packages(packages, failure_icon, failure_hint=None):
+    """Install packages in a single pip call, retrying one by one only if that fails"""
+    print(f"   Installing {', '.join(packages)}...")
+    if pip_install(packages).returncode == 0:
+        for package in packages:
+            print(f"   ✅ {package} installed successfully")
+        return
+    
+    # Find out which packages are at fault
+    for package in packages:
+        result = pip_install([package])
+        if result.returncode == 0:
+            print(f"   ✅ {package} installed successfully")
+        else:
+            print(f"   {failure_icon} Failed to install {package}")
+            print(f"      Error: {result.stderr}")
+            if failure_hint:
+                print(f"      {failure_hint}")
+
 def install_dependencies():
     """Install all required dependencies"""
-    print("\n" + "="*60)
-    print("🔧 VUTAX 2.0 - DEPENDENCY INSTALLATION")
-    print("="*60)
-    print("\n📦 This script will install:")
-    print("   • Flask and Flask-SocketIO for web services")
-    print("   • Pandas and NumPy for data processing")
-    print("   • Scikit-learn for machine learning")
-    print("   • Pandas-TA for technical analysis")
-    print("   • YFinance for market data")
-    print("   • Matplotlib for visualization")
-    print("\n" + "="*60 + "\n")
+    sys.stdout.write(BANNER)
     
     # Core packages that are essential
     core_packages = [
         'flask>=2.3.0',
         'flask-socketio>=5.3.0', 
+        'eventlet>=0.33.3',
+        'jsonpatch>=1.33',
+        'msgpack>=1.0.5',
+        'orjson>=3.9.5',
         'requests>=2.31.0',
         'pandas>=2.0.0',
         'numpy>=1.24.0',
@@ -40,43 +90,12 @@ def install_dependencies():
     ]
     
     print("🚀 Installing core packages...")
-    for package in core_packages:
-        try:
-            print(f"   Installing {package}...")
-            result = subprocess.run([
-                sys.executable, '-m', 'pip', 'install', package
-            ], capture_output=True, text=True, check=True)
-            print(f"   ✅ {package} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"   ❌ Failed to install {package}")
-            print(f"      Error: {e.stderr}")
+    install_packages(core_packages, '❌')
     
     print("\n🤖 Installing ML and financial packages...")
-    for package in ml_packages:
-        try:
-            print(f"   Installing {package}...")
-            result = subprocess.run([
-                sys.executable, '-m', 'pip', 'install', package
-            ], capture_output=True, text=True, check=True)
-            print(f"   ✅ {package} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  Failed to install {package}")
-            print(f"      Error: {e.stderr}")
-            print(f"      This package may require additional setup")
+    install_packages(ml_packages, '⚠️ ', 'This package may require additional setup')
     
-    print("\n" + "="*60)
-    print("✅ DEPENDENCY INSTALLATION COMPLETE!")
-    print("="*60)
-    print("\n🎯 Next steps:")
-    print("   1. Run: python start_website.py (for Flask website)")
-    print("   2. Run: python start_training.py (for AI training)")
-    print("   3. Visit: http://localhost:3000 (main platform)")
-    print("   4. Visit: http://localhost:5000 (training dashboard)")
-    print("\n💡 If any packages failed to install:")
-    print("   • Try: pip install -r requirements.txt")
-    print("   • For pandas-ta issues: pip install --upgrade pandas-ta")
-    print("   • For Windows TA-Lib: download from unofficial binaries")
-    print("\n" + "="*60 + "\n")
+    sys.stdout.write(SUMMARY)
 
 if __name__ == '__main__':
     try:
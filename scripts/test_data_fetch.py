@@ -8,6 +8,7 @@ import asyncio
 import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the ML service to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend', 'ml-service'))
@@ -18,6 +19,14 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Threads for blocking yfinance calls, so they don't stall the event loop
+YF_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def _fetch_yf_info(symbol):
+    """Blocking yfinance lookup of a ticker's info dict"""
+    import yfinance as yf
+    return yf.Ticker(symbol).info
+
 async def test_data_service():
     """Test the data service functionality"""
     logger.info("🧪 Testing Data Service...")
@@ -30,26 +39,34 @@ async def test_data_service():
         # Test getting stock data
         test_symbols = ['AAPL', 'MSFT', 'GOOGL']
         
-        for symbol in test_symbols:
+        async def probe(symbol):
             logger.info(f"Testing data fetch for {symbol}...")
             
-            try:
-                # Test historical data
-                data = await data_service.get_stock_data(symbol, period='1y')
-                if data is not None and not data.empty:
-                    logger.info(f"✅ {symbol}: Got {len(data)} historical records")
-                else:
-                    logger.warning(f"⚠️ {symbol}: No historical data received")
-                
-                # Test real-time data
-                real_time = await data_service.get_real_time_price(symbol)
-                if real_time:
-                    logger.info(f"✅ {symbol}: Real-time price: ${real_time.get('price', 'N/A')}")
-                else:
-                    logger.warning(f"⚠️ {symbol}: No real-time data received")
-                    
-            except Exception as e:
-                logger.error(f"❌ {symbol}: Data fetch failed - {e}")
+            # Historical and real-time data are fetched concurrently; failures come back as values
+            data, real_time = await asyncio.gather(
+                data_service.get_stock_data(symbol, period='1y'),
+                data_service.get_real_time_price(symbol),
+                return_exceptions=True
+            )
+            
+            # Test historical data
+            if isinstance(data, Exception):
+                logger.error(f"❌ {symbol}: Data fetch failed - {data}")
+            elif data is not None and not data.empty:
+                logger.info(f"✅ {symbol}: Got {len(data)} historical records")
+            else:
+                logger.warning(f"⚠️ {symbol}: No historical data received")
+            
+            # Test real-time data
+            if isinstance(real_time, Exception):
+                logger.error(f"❌ {symbol}: Real-time fetch failed - {real_time}")
+            elif real_time:
+                logger.info(f"✅ {symbol}: Real-time price: ${real_time.get('price', 'N/A')}")
+            else:
+                logger.warning(f"⚠️ {symbol}: No real-time data received")
+        
+        # All symbols are probed concurrently
+        await asyncio.gather(*(probe(symbol) for symbol in test_symbols))
         
         # Test market status
         try:
@@ -65,6 +82,24 @@ async def test_data_service():
         logger.error(f"❌ Data Service test failed: {e}")
         return False
 
+# Concurrent fetches in the data collection test; lower it to stay inside API rate limits
+FETCH_CONCURRENCY = int(os.getenv('TEST_FETCH_CONCURRENCY', '8'))
+
+async def collect_training_data(auto_trainer):
+    """Fetch the trainer's stock universe concurrently, at most FETCH_CONCURRENCY at a time"""
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+    
+    async def fetch(symbol):
+        async with semaphore:
+            try:
+                return symbol, await auto_trainer.data_service.get_stock_data(symbol, period='1y', interval='1d')
+            except Exception as e:
+                logger.error(f"❌ Data fetch failed for {symbol}: {e}")
+                return symbol, None
+    
+    results = await asyncio.gather(*(fetch(symbol) for symbol in auto_trainer.stock_universe))
+    return {symbol: data for symbol, data in results if data is not None and not data.empty}
+
 async def test_auto_trainer():
     """Test the auto trainer functionality"""
     logger.info("🧪 Testing Auto Trainer...")
@@ -83,7 +118,7 @@ async def test_auto_trainer():
         auto_trainer.stock_universe = ['AAPL', 'MSFT', 'GOOGL']  # Limit for testing
         
         try:
-            training_data = await auto_trainer._collect_comprehensive_training_data()
+            training_data = await collect_training_data(auto_trainer)
             logger.info(f"✅ Collected training data for {len(training_data)} stocks")
             
             for symbol, data in training_data.items():
@@ -118,37 +153,41 @@ async def test_api_keys():
     else:
         logger.warning("⚠️ Resend API key not found in environment")
     
-    # Test basic API connectivity
-    try:
-        import requests
+    # Test basic API connectivity; both providers are checked concurrently
+    async def check_alpha_vantage():
+        import aiohttp
         
-        # Test Alpha Vantage (if key available)
-        if alpha_vantage_key:
-            url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol=AAPL&apikey={alpha_vantage_key}"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if 'Global Quote' in data:
-                    logger.info("✅ Alpha Vantage API connectivity confirmed")
+        url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol=AAPL&apikey={alpha_vantage_key}"
+        connector = aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if 'Global Quote' in data:
+                        logger.info("✅ Alpha Vantage API connectivity confirmed")
+                    else:
+                        logger.warning("⚠️ Alpha Vantage API returned unexpected format")
                 else:
-                    logger.warning("⚠️ Alpha Vantage API returned unexpected format")
-            else:
-                logger.warning(f"⚠️ Alpha Vantage API returned status {response.status_code}")
-        
-        # Test Yahoo Finance (free alternative)
+                    logger.warning(f"⚠️ Alpha Vantage API returned status {response.status}")
+    
+    async def check_yahoo_finance():
         try:
-            import yfinance as yf
-            ticker = yf.Ticker("AAPL")
-            info = ticker.info
+            info = await asyncio.get_running_loop().run_in_executor(YF_EXECUTOR, _fetch_yf_info, 'AAPL')
             if info and 'currentPrice' in info:
                 logger.info("✅ Yahoo Finance connectivity confirmed")
             else:
                 logger.warning("⚠️ Yahoo Finance returned unexpected format")
         except Exception as e:
             logger.warning(f"⚠️ Yahoo Finance test failed: {e}")
-        
-    except Exception as e:
-        logger.error(f"❌ API connectivity test failed: {e}")
+    
+    # Test Alpha Vantage (if key available) and Yahoo Finance (free alternative)
+    checks = [check_yahoo_finance()]
+    if alpha_vantage_key:
+        checks.append(check_alpha_vantage())
+    
+    for result in await asyncio.gather(*checks, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.error(f"❌ API connectivity test failed: {result}")
     
     return True
 
@@ -4,18 +4,57 @@ VUTAX 2.0 - Flask AI Training Launcher
 Starts ML training using Flask and opens progress tracking dashboard
 """
 
+import asyncio
+import functools
+import importlib.util
+import json
 import os
+import random
+import socket
 import sys
 import time
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import webbrowser
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent
 
 # Add backend paths
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend', 'ml-service'))
+sys.path.append(str(BASE_DIR / 'backend'))
+sys.path.append(str(BASE_DIR / 'backend' / 'ml-service'))
+
+TRACKER_URL = 'http://localhost:5000'
+ML_SERVICE_URL = 'http://localhost:8001'
+
+# Keep-alive session for every request to the tracker; callers handle failures, so no retries
+tracker_session = requests.Session()
+tracker_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=0))
+tracker_session.mount('http://', tracker_adapter)
+tracker_session.mount('https://', tracker_adapter)
+
+# Readiness probes back off exponentially from READINESS_MIN_DELAY to READINESS_MAX_DELAY
+# (with jitter) until the tracker answers, for at most READINESS_TIMEOUT seconds
+READINESS_MIN_DELAY = 0.05
+READINESS_MAX_DELAY = 1.0
+READINESS_TIMEOUT = 30
+
+# Line the tracker prints once it is listening; tracker_started is set when the launcher reads it
+TRACKER_READY_SENTINEL = '__READY__'
+tracker_started = threading.Event()
+
+# Successful setup checks are remembered here so later launches can skip them; --force rechecks
+HEALTH_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.vutax', 'healthcache.json')
+FORCE_CHECKS = '--force' in sys.argv[1:]
+
+# Multi-line progress reports instead of a single updating status line, for CI logs and --plain
+PLAIN_OUTPUT = '--plain' in sys.argv[1:] or not sys.stdout.isatty()
 
 def print_header():
     """Print the startup header"""
@@ -31,57 +70,93 @@ def print_header():
     print("📊 Progress tracking: http://localhost:5000")
     print("\n" + "="*60 + "\n")
 
+def cached_check(ttl, key):
+    """Skip the wrapped check while its last successful run, stored under `key`, is under `ttl` seconds old"""
+    # Results are per interpreter; another venv has its own set of installed packages
+    cache_key = f'{key}:{sys.executable}'
+    
+    def decorator(check):
+        @functools.wraps(check)
+        def wrapper(*args, **kwargs):
+            try:
+                with open(HEALTH_CACHE_PATH) as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+            
+            entry = cache.get(cache_key) or {}
+            age = time.time() - entry.get('ts', 0)
+            if not FORCE_CHECKS and entry.get('ok') and age < ttl:
+                print(f"✅ Skipping {key} check, it passed {int(age // 60)} min ago (run with --force to recheck)")
+                return True
+            
+            ok = check(*args, **kwargs)
+            cache[cache_key] = {'ts': time.time(), 'ok': bool(ok)}
+            try:
+                os.makedirs(os.path.dirname(HEALTH_CACHE_PATH), exist_ok=True)
+                with open(HEALTH_CACHE_PATH, 'w') as f:
+                    json.dump(cache, f)
+            except OSError:
+                pass
+            return ok
+        return wrapper
+    return decorator
+
+# Non-interactive pip without the version self-check, preferring wheels over source builds
+PIP_INSTALL = [sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check', '--prefer-binary', '--no-input']
+
+# Module names for packages whose pip name differs
+IMPORT_NAMES = {'flask-socketio': 'flask_socketio', 'scikit-learn': 'sklearn', 'pandas-ta': 'pandas_ta'}
+
+def find_missing_packages(packages):
+    """Packages whose module cannot be located"""
+    # Locate each package's module without importing it; pandas/sklearn imports alone take seconds
+    return [
+        package for package in packages
+        if importlib.util.find_spec(IMPORT_NAMES.get(package, package)) is None
+    ]
+
+@cached_check(ttl=3600, key='pydeps')
 def check_python_deps():
     """Check if required Python packages are available"""
     print("📋 Checking Python dependencies...")
     
     # Core packages for training tracker
-    required_packages = ['flask', 'flask-socketio', 'requests', 'pandas', 'numpy', 'scikit-learn']
+    required_packages = ['flask', 'flask-socketio', 'eventlet', 'jsonpatch', 'msgpack', 'orjson',
+                         'requests', 'aiohttp', 'pandas', 'numpy', 'scikit-learn']
     
     # Additional ML packages needed for analytical model
     ml_packages = ['pandas-ta', 'yfinance', 'matplotlib']
     
-    missing_packages = []
-    
-    # Check core packages
-    for package in required_packages:
-        try:
-            if package == 'scikit-learn':
-                __import__('sklearn')
-            elif package == 'flask-socketio':
-                __import__('flask_socketio')
-            else:
-                __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
-    # Check ML packages
-    for package in ml_packages:
-        try:
-            if package == 'pandas-ta':
-                __import__('pandas_ta')
-            else:
-                __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    missing_packages = find_missing_packages(required_packages + ml_packages)
     
     if missing_packages:
         print(f"❌ Missing packages: {', '.join(missing_packages)}")
         print("   Installing missing packages...")
         try:
-            # Install packages one by one to handle potential conflicts
-            for package in missing_packages:
-                print(f"   Installing {package}...")
-                result = subprocess.run([sys.executable, '-m', 'pip', 'install', package], 
-                                     capture_output=True, text=True)
-                if result.returncode != 0:
-                    print(f"   ⚠️  Failed to install {package}: {result.stderr}")
-            print("✅ Package installation completed")
+            # One pip run for everything; fall back to one by one if a conflict fails the batch
+            pip_env = {**os.environ, 'PIP_NO_PYTHON_VERSION_WARNING': '1'}
+            result = subprocess.run(PIP_INSTALL + missing_packages, capture_output=True, text=True, env=pip_env)
+            if result.returncode != 0:
+                for package in missing_packages:
+                    print(f"   Installing {package}...")
+                    result = subprocess.run(PIP_INSTALL + [package], capture_output=True, text=True, env=pip_env)
+                    if result.returncode != 0:
+                        print(f"   ⚠️  Failed to install {package}: {result.stderr}")
         except Exception as e:
             print(f"⚠️  Could not install packages automatically: {e}")
             print(f"   Please run: pip install {' '.join(missing_packages)}")
             print("   Note: pandas-ta may require additional setup")
             return False
+        
+        # Probe again so a failed install is not cached as a passing check
+        importlib.invalidate_caches()
+        still_missing = find_missing_packages(missing_packages)
+        if still_missing:
+            print(f"❌ Still missing after install: {', '.join(still_missing)}")
+            print(f"   Please run: pip install {' '.join(still_missing)}")
+            return False
+        print("✅ Package installation completed")
     else:
         print("✅ All required packages available")
     
@@ -93,33 +168,49 @@ def setup_ml_environment():
     
     # Ensure data directories exist
     ml_dirs = [
-        'backend/ml-service/data',
-        'backend/ml-service/models/saved',
-        'backend/ml-service/cache',
-        'backend/ml-service/logs',
-        'data/market_data',
-        'data/models',
-        'data/cache',
-        'data/logs'
+        BASE_DIR / 'backend' / 'ml-service' / 'data',
+        BASE_DIR / 'backend' / 'ml-service' / 'models' / 'saved',
+        BASE_DIR / 'backend' / 'ml-service' / 'cache',
+        BASE_DIR / 'backend' / 'ml-service' / 'logs',
+        BASE_DIR / 'data' / 'market_data',
+        BASE_DIR / 'data' / 'models',
+        BASE_DIR / 'data' / 'cache',
+        BASE_DIR / 'data' / 'logs'
     ]
     
-    for dir_path in ml_dirs:
-        full_path = os.path.join(os.path.dirname(__file__), dir_path)
-        os.makedirs(full_path, exist_ok=True)
+    # On re-runs everything exists already; a stat is cheaper than a mkdir that fails with EEXIST
+    missing_dirs = [path for path in ml_dirs if not path.is_dir()]
+    
+    # Each mkdir is a round trip on network or Windows filesystems, so issue them concurrently
+    if missing_dirs:
+        with ThreadPoolExecutor(max_workers=len(missing_dirs)) as executor:
+            list(executor.map(lambda path: path.mkdir(parents=True, exist_ok=True), missing_dirs))
     
     print("✅ ML environment ready")
     return True
 
+def relay_tracker_output(stream):
+    """Echo the tracker's stdout and set tracker_started when its ready sentinel appears"""
+    for line in stream:
+        if line.strip() == TRACKER_READY_SENTINEL:
+            tracker_started.set()
+        else:
+            sys.stdout.write(line)
+
 def start_training_tracker():
     """Start the training progress tracker using Flask"""
     print("\n📊 Starting training progress tracker...")
     
     try:
-        # Start the training tracker Flask app
+        # Start the training tracker Flask app; it prints the ready sentinel once it is listening
         tracker_process = subprocess.Popen([
             sys.executable, 
             os.path.join('backend', 'training-tracker', 'app.py')
-        ], cwd=os.path.dirname(__file__))
+        ], stdout=subprocess.PIPE, text=True, bufsize=1, close_fds=False,
+            env={**os.environ, 'TRACKER_ANNOUNCE_READY': '1', 'PYTHONUNBUFFERED': '1'})
+        
+        # Keep draining the pipe for the tracker's whole life so it never blocks on a full pipe
+        threading.Thread(target=relay_tracker_output, args=(tracker_process.stdout,), daemon=True).start()
         
         print("✅ Training tracker started at http://localhost:5000")
         return tracker_process
@@ -138,7 +229,7 @@ def start_ml_service():
         if os.path.exists(ml_service_path):
             ml_process = subprocess.Popen([
                 sys.executable, ml_service_path
-            ], cwd=os.path.dirname(__file__))
+            ], close_fds=False)
             print("✅ ML service started")
             return ml_process
         else:
@@ -149,27 +240,144 @@ def start_ml_service():
         print(f"⚠️  Could not start ML service: {e}")
         return None
 
-def wait_for_services():
+class Supervisor:
+    """
+    Restarts supervised child processes that exit without being asked to, backing off exponentially.
+    Watches from a daemon thread, so children are only supervised while this launcher is running.
+    """
+    
+    def __init__(self, check_interval=2, max_backoff=60, max_restarts=5):
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts
+        self.children = {}
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def register(self, name, process, start):
+        """Supervise `process`; `start()` launches a replacement and returns it, or None on failure"""
+        with self._lock:
+            self.children[name] = {'process': process, 'start': start, 'restarts': 0,
+                                   'started_at': time.monotonic(), 'retry_at': 0.0}
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, daemon=True)
+                self._thread.start()
+    
+    def _watch(self):
+        """Poll every child and restart the ones that died once their back-off has passed"""
+        while not self.stopping.wait(self.check_interval):
+            with self._lock:
+                for name, child in self.children.items():
+                    self._check(name, child, time.monotonic())
+    
+    def _check(self, name, child, now):
+        process = child['process']
+        if process is not None:
+            if process.poll() is None:
+                return
+            # A child that ran for a while before dying starts its back-off over
+            if now - child['started_at'] > self.max_backoff:
+                child['restarts'] = 0
+            child['process'] = None
+            child['retry_at'] = now + min(self.max_backoff, 2 ** child['restarts'])
+            print(f"\n⚠️  {name} exited with code {process.returncode}")
+            return
+        
+        if child['restarts'] >= self.max_restarts or now < child['retry_at']:
+            return
+        child['restarts'] += 1
+        print(f"🔄 Restarting {name} (attempt {child['restarts']}/{self.max_restarts})...")
+        child['process'] = child['start']()
+        child['started_at'] = now
+        if child['process'] is None:
+            child['retry_at'] = now + min(self.max_backoff, 2 ** child['restarts'])
+        elif child['restarts'] == self.max_restarts:
+            print(f"   {name} will not be restarted again if it exits")
+    
+    def stop(self):
+        """Stop supervising and terminate every running child"""
+        self.stopping.set()
+        with self._lock:
+            for child in self.children.values():
+                if child['process'] is not None and child['process'].poll() is None:
+                    child['process'].terminate()
+
+def service_running(url):
+    """Whether something already accepts connections on the service's port"""
+    address = urlsplit(url)
+    try:
+        with socket.create_connection((address.hostname, address.port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+# time.monotonic() at which each service URL was last confirmed ready by wait_for_services
+_service_ready_since = {}
+
+def is_service_ready(url, max_age=30):
+    """Whether `url` was confirmed ready within the last `max_age` seconds"""
+    ready_since = _service_ready_since.get(url)
+    return ready_since is not None and time.monotonic() - ready_since < max_age
+
+async def poll_until_ready(session, url, ready):
+    """Probe `url` until it answers 200, then set `ready`"""
+    import aiohttp
+    
+    attempt = 0
+    while not ready.is_set():
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=2)) as response:
+                if response.status == 200:
+                    ready.set()
+                    return
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        delay = min(READINESS_MAX_DELAY, READINESS_MIN_DELAY * 1.6 ** attempt)
+        await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+        attempt += 1
+
+async def wait_for_tracker_sentinel(ready):
+    """Set `ready` once the tracker's ready sentinel has been read from its stdout"""
+    # Short waits keep the worker thread from outliving the event loop once the poll is cancelled
+    while not ready.is_set():
+        if await asyncio.to_thread(tracker_started.wait, 0.5):
+            ready.set()
+
+async def wait_for_services(check_ml_service=False):
     """Wait for services to be ready"""
     print("\n⏳ Waiting for services to start up...")
+    import aiohttp
+    
+    tracker_ready = asyncio.Event()
+    ml_ready = asyncio.Event()
     
-    max_attempts = 15
-    for attempt in range(max_attempts):
+    async with aiohttp.ClientSession() as session:
+        # The tracker announces itself on stdout; the HTTP poll covers a tracker that was already running
+        pollers = [
+            asyncio.create_task(wait_for_tracker_sentinel(tracker_ready)),
+            asyncio.create_task(poll_until_ready(session, f'{TRACKER_URL}/api/status', tracker_ready))
+        ]
+        if check_ml_service:
+            pollers.append(asyncio.create_task(poll_until_ready(session, f'{ML_SERVICE_URL}/health', ml_ready)))
+        
         try:
-            # Check training tracker
-            response = requests.get('http://localhost:5000/api/status', timeout=2)
-            if response.status_code == 200:
-                print("✅ Training tracker is ready")
-                break
-        except requests.exceptions.RequestException:
-            pass
+            await asyncio.wait_for(tracker_ready.wait(), READINESS_TIMEOUT)
+            _service_ready_since[TRACKER_URL] = time.monotonic()
+            print("✅ Training tracker is ready")
+        except asyncio.TimeoutError:
+            print("⚠️  Services may still be starting up")
         
-        if attempt < max_attempts - 1:
-            time.sleep(2)
-            if attempt % 5 == 0:
-                print(f"   Still starting up... ({attempt + 1}/{max_attempts})")
-    else:
-        print("⚠️  Services may still be starting up")
+        if check_ml_service:
+            if ml_ready.is_set():
+                _service_ready_since[ML_SERVICE_URL] = time.monotonic()
+                print("✅ ML service is ready")
+            else:
+                print("   ML service is still starting up")
+        
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
 
 def start_training():
     """Start the AI model training"""
@@ -178,14 +386,15 @@ def start_training():
     print("   - Feature Engineering: 70+ technical indicators")
     print("   - Real-time Analysis: Market sentiment and trends")
     
-    # Wait a moment for services to be ready
-    time.sleep(3)
+    # Wait a moment for services to be ready, unless the tracker was just confirmed ready
+    if not is_service_ready(TRACKER_URL):
+        time.sleep(3)
     
     try:
         # Try to start training via training tracker
-        response = requests.post('http://localhost:5000/api/start-training',
-                               json={'model_type': 'analytical'},
-                               timeout=10)
+        response = tracker_session.post(f'{TRACKER_URL}/api/start-training',
+                                        json={'model_type': 'analytical'},
+                                        timeout=10)
         
         if response.status_code == 200:
             print("✅ Training started successfully")
@@ -199,8 +408,19 @@ def start_training():
         print("   You can start training manually from the dashboard")
         return True
 
+def can_open_browser():
+    """Whether a browser can be shown: not opted out with BROWSER=none and not a headless session"""
+    if os.environ.get('BROWSER') == 'none':
+        return False
+    return (sys.platform in ('win32', 'darwin')
+            or bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')))
+
 def open_dashboard():
     """Open the training dashboard in browser"""
+    if not can_open_browser():
+        print("\n📊 Training dashboard: http://localhost:5000")
+        return
+    
     print("\n🌐 Opening training progress dashboard...")
     
     try:
@@ -238,32 +458,60 @@ def monitor_training():
     print("🔄 Monitoring training progress...")
     print("   (Press Ctrl+C to stop monitoring, training will continue)\n")
     
+    last_stage = None
+    last_report = 0.0
+    status_line_open = False
     try:
         while True:
             try:
-                response = requests.get('http://localhost:5000/api/status', timeout=5)
-                if response.status_code == 200:
-                    status = response.json()
-                    
-                    if status.get('is_training', False):
-                        progress = status.get('progress', 0)
-                        stage = status.get('current_stage', 'training')
-                        eta = status.get('eta_minutes', 0)
-                        
-                        print(f"🤖 Training in progress: {stage} ({progress:.1f}%)")
-                        if eta > 0:
-                            print(f"⏱️  Estimated time remaining: {eta} minutes")
-                        print(f"   Last updated: {datetime.now().strftime('%H:%M:%S')}")
-                        print()
-                    else:
-                        print("✅ Training completed or idle")
-                        print("📊 Check the dashboard for results: http://localhost:5000")
-                        break
+                # The tracker pushes the dashboard summary whenever it changes, with a keep-alive
+                # comment every 15 seconds, so a read stalling for 45 seconds means the stream is gone
+                with tracker_session.get(f'{TRACKER_URL}/api/status/stream', stream=True, timeout=(5, 45)) as response:
+                    if response.status_code == 200:
+                        for line in response.iter_lines():
+                            if not line.startswith(b'data: '):
+                                continue
+                            status = json.loads(line[6:])
+                            
+                            if not status.get('is_training', False):
+                                if status_line_open:
+                                    sys.stdout.write("\n")
+                                print("✅ Training completed or idle")
+                                print("📊 Check the dashboard for results: http://localhost:5000")
+                                return
+                            
+                            stage = status.get('current_stage', 'training')
+                            progress = status.get('progress', 0)
+                            eta = status.get('eta_minutes', 0)
+                            
+                            # Rewrite one status line in place on every update: a single write, no scrollback
+                            if not PLAIN_OUTPUT:
+                                eta_text = f" ETA {eta}m" if eta > 0 else ""
+                                sys.stdout.write(f"\r🤖 {stage} {progress:5.1f}%{eta_text}  "
+                                                 f"{datetime.now().strftime('%H:%M:%S')}\033[K")
+                                sys.stdout.flush()
+                                status_line_open = True
+                                continue
+                            
+                            # Report stage changes right away and otherwise at most every 30 seconds
+                            if stage == last_stage and time.monotonic() - last_report < 30:
+                                continue
+                            last_stage = stage
+                            last_report = time.monotonic()
+                            
+                            print(f"🤖 Training in progress: {stage} ({progress:.1f}%)")
+                            if eta > 0:
+                                print(f"⏱️  Estimated time remaining: {eta} minutes")
+                            print(f"   Last updated: {datetime.now().strftime('%H:%M:%S')}")
+                            print()
                         
             except requests.exceptions.RequestException:
+                if status_line_open:
+                    sys.stdout.write("\n")
+                    status_line_open = False
                 print("📡 Checking services...")
             
-            time.sleep(30)  # Check every 30 seconds
+            time.sleep(5)  # Reconnect after the stream drops
             
     except KeyboardInterrupt:
         print("\n🔄 Monitoring stopped (training continues in background)")
@@ -271,6 +519,10 @@ def monitor_training():
 
 def main():
     """Main function"""
+    # Children inherit this directory. Passing no cwd (and close_fds=False; our descriptors are
+    # non-inheritable anyway) lets subprocess launch them with posix_spawn instead of fork + exec.
+    os.chdir(BASE_DIR)
+    
     print_header()
     
     # Ask user to continue
@@ -282,37 +534,50 @@ def main():
     
     print("🚀 Starting VUTAX 2.0 Flask AI Training System...\n")
     
-    # Check Python dependencies
-    if not check_python_deps():
-        input("\nPress Enter to exit...")
-        sys.exit(1)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Check Python dependencies and set up the ML environment side by side
+        setup_checks = [executor.submit(check_python_deps), executor.submit(setup_ml_environment)]
+        if not all(future.result() for future in setup_checks):
+            input("\nPress Enter to exit...")
+            sys.exit(1)
+        
+        # Reuse a tracker or ML service that is already listening (e.g. from an earlier launch);
+        # a second copy could not bind the port and would only exit and be restarted
+        tracker_running = service_running(TRACKER_URL)
+        ml_running = service_running(ML_SERVICE_URL)
+        
+        # Start training tracker and ML service (optional) together; neither waits on the other
+        tracker_future = None if tracker_running else executor.submit(start_training_tracker)
+        ml_future = None if ml_running else executor.submit(start_ml_service)
+        tracker_process = tracker_future.result() if tracker_future else None
+        ml_process = ml_future.result() if ml_future else None
     
-    # Setup ML environment
-    if not setup_ml_environment():
-        input("\nPress Enter to exit...")
-        sys.exit(1)
+    if tracker_running:
+        print(f"✅ Training tracker already running at {TRACKER_URL}")
+    if ml_running:
+        print("✅ ML service already running")
     
-    # Start training tracker
-    tracker_process = start_training_tracker()
-    if not tracker_process:
+    if not tracker_process and not tracker_running:
+        if ml_process:
+            ml_process.terminate()
         input("\nPress Enter to exit...")
         sys.exit(1)
     
-    # Start ML service (optional)
-    ml_process = start_ml_service()
+    # Restart either service we started if it dies while training runs
+    supervisor = Supervisor()
+    if tracker_process:
+        supervisor.register('Training tracker', tracker_process, start_training_tracker)
+    if ml_process:
+        supervisor.register('ML service', ml_process, start_ml_service)
     
     # Wait for services
-    wait_for_services()
+    asyncio.run(wait_for_services(check_ml_service=ml_process is not None or ml_running))
     
     # Start training
     start_training()
     
-    # Open dashboard with delay
-    def delayed_open():
-        time.sleep(3)
-        open_dashboard()
-    
-    threading.Thread(target=delayed_open, daemon=True).start()
+    # Open dashboard; the tracker is already serving, so there is nothing to wait for
+    threading.Thread(target=open_dashboard, daemon=True).start()
     
     # Print status
     print_status()
@@ -335,10 +600,7 @@ def main():
             stop = input("\nStop training services? (y/N): ").lower().strip()
             if stop == 'y':
                 print("🛑 Stopping training services...")
-                if tracker_process:
-                    tracker_process.terminate()
-                if ml_process:
-                    ml_process.terminate()
+                supervisor.stop()
                 print("✅ Training services stopped")
             else:
                 print("🔄 Training services continue running in background")
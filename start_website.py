@@ -4,33 +4,87 @@ VUTAX 2.0 - Flask Website Launcher
 Starts the VUTAX trading platform using Flask
 """
 
+import hashlib
+import html
+import http.client
+import importlib.util
+import json
 import os
+import signal
 import sys
 import time
-import subprocess
-import requests
-import webbrowser
 import threading
-from datetime import datetime
-from flask import Flask, render_template, jsonify, send_from_directory
+import zlib
+from pathlib import Path
 
-# Add backend paths
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
-sys.path.append(os.path.join(os.path.dirname(__file__), 'backend', 'ml-service'))
+BASE_DIR = Path(__file__).resolve().parent
+
+HEADER = "\n".join([
+    "\n" + "="*60,
+    "              VUTAX 2.0 - FLASK WEBSITE LAUNCHER",
+    "="*60,
+    "\n🌐 This script will:",
+    "   1. Start the VUTAX trading platform using Flask",
+    "   2. Launch ML service for AI analysis",
+    "   3. Open the main platform in your browser",
+    "   4. Ready for trading and AI analysis",
+    "\n🚀 Platform URL: http://localhost:3000",
+    "📊 Features: Trading, AI recommendations, portfolio tracking",
+    "\n" + "="*60 + "\n"
+]) + "\n"
+
+PLATFORM_INFO = "\n".join([
+    "\n" + "="*60,
+    "                  FLASK PLATFORM READY!",
+    "="*60,
+    "\n🌐 Main Platform: http://localhost:3000 (Flask)",
+    "🤖 Training Tracker: http://localhost:5000",
+    "📊 API Endpoints: /api/stocks",
+    "\n🎯 Platform Features:",
+    "   • Beautiful Flask-based web interface",
+    "   • Real-time stock data and analysis",
+    "   • AI-powered trading recommendations",
+    "   • Interactive portfolio management",
+    "   • Plus buttons to add stocks to watchlist",
+    "   • Smooth animations and modern UI",
+    "\n🤖 AI Features:",
+    "   • Background ML service for training",
+    "   • Real-time AI score calculations",
+    "   • Market sentiment analysis",
+    "   • Automatic model improvements",
+    "\n" + "="*60,
+    "\n💡 Tips:",
+    "   - Click the + button on stock cards to add to watchlist",
+    "   - Visit /discover and /watchlist pages (coming soon)",
+    "   - Check http://localhost:5000 for AI training progress",
+    "   - All data is stored locally in data/ folders",
+    "\n" + "="*60 + "\n"
+]) + "\n"
 
 def print_header():
     """Print the startup header"""
-    print("\n" + "="*60)
-    print("              VUTAX 2.0 - FLASK WEBSITE LAUNCHER")
-    print("="*60)
-    print("\n🌐 This script will:")
-    print("   1. Start the VUTAX trading platform using Flask")
-    print("   2. Launch ML service for AI analysis")
-    print("   3. Open the main platform in your browser")
-    print("   4. Ready for trading and AI analysis")
-    print("\n🚀 Platform URL: http://localhost:3000")
-    print("📊 Features: Trading, AI recommendations, portfolio tracking")
-    print("\n" + "="*60 + "\n")
+    sys.stdout.write(HEADER)
+
+def write_gitkeep(dir_path):
+    """Create dir_path (a Path) if needed and give it a .gitkeep while it is empty, so git tracks it"""
+    gitkeep_path = dir_path / '.gitkeep'
+    # On re-runs the .gitkeep is there already, and this one lstat is all the work
+    if os.path.lexists(gitkeep_path):
+        return
+    
+    try:
+        dir_path.mkdir(parents=True)
+    except FileExistsError:
+        # A directory that already holds files is tracked through them
+        with os.scandir(dir_path) as entries:
+            if any(True for _ in entries):
+                return
+    
+    fd = os.open(gitkeep_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+    try:
+        os.write(fd, b'# Keep this directory in git\n')
+    finally:
+        os.close(fd)
 
 def setup_data_storage():
     """Set up data storage directories for ML training"""
@@ -48,48 +102,92 @@ def setup_data_storage():
     ]
     
     for dir_path in data_dirs:
-        full_path = os.path.join(os.path.dirname(__file__), dir_path)
-        os.makedirs(full_path, exist_ok=True)
-        
-        # Create .gitkeep file to track empty directories
-        gitkeep_path = os.path.join(full_path, '.gitkeep')
-        if not os.path.exists(gitkeep_path):
-            with open(gitkeep_path, 'w') as f:
-                f.write('# Keep this directory in git\n')
+        write_gitkeep(BASE_DIR / dir_path)
     
     print("✅ Data storage directories created")
 
 def check_python_deps():
     """Check if required Python packages are available"""
-    print("📋 Checking Python dependencies...")
+    import subprocess
     
-    required_packages = ['flask', 'requests', 'pandas', 'numpy']
-    missing_packages = []
+    print("📋 Checking Python dependencies...")
     
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # The platform launches the training tracker, which needs Flask-SocketIO and its eventlet stack
+    required_packages = ['flask', 'flask_socketio', 'eventlet', 'jsonpatch', 'msgpack', 'orjson',
+                         'requests', 'pandas', 'numpy']
+    # Locate each module without importing it; pandas and numpy alone take hundreds of ms to load
+    missing_packages = [package for package in required_packages if importlib.util.find_spec(package) is None]
     
     if missing_packages:
         print(f"❌ Missing packages: {', '.join(missing_packages)}")
         print("   Installing missing packages...")
         try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install'] + missing_packages, 
-                         check=True, capture_output=True)
+            # Non-interactive, without pip's version self-check, preferring wheels over source builds
+            subprocess.run([sys.executable, '-m', 'pip', 'install', '--no-input', '--disable-pip-version-check',
+                            '--prefer-binary'] + missing_packages,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
             print("✅ Packages installed successfully")
-        except subprocess.CalledProcessError:
+        except subprocess.CalledProcessError as e:
             print("⚠️  Could not install packages automatically")
-            print("   Please run: pip install flask requests pandas numpy")
+            print(f"   {e.stderr.strip()}")
+            print(f"   Please run: pip install {' '.join(missing_packages)}")
             return False
     else:
         print("✅ All required packages available")
     
     return True
 
+def render_stock_card(stock):
+    """Dashboard card for one stock; the AI score is derived from the symbol so the page is static"""
+    up = stock['change'] >= 0
+    ai_score = 60 + zlib.crc32(stock['symbol'].encode('utf-8')) % 40
+    return f'''
+                                <div class="bg-white rounded-xl p-6 shadow-lg card-hover cursor-pointer">
+                                    <div class="flex justify-between items-start mb-4">
+                                        <div>
+                                            <h3 class="text-xl font-bold">{html.escape(stock['symbol'])}</h3>
+                                            <p class="text-gray-600 text-sm">{html.escape(stock['name'])}</p>
+                                        </div>
+                                        <button class="w-8 h-8 bg-blue-100 hover:bg-blue-200 rounded-full flex items-center justify-center transition-all">
+                                            <span class="text-blue-600">+</span>
+                                        </button>
+                                    </div>
+                                    <div class="flex justify-between items-end">
+                                        <div>
+                                            <div class="text-2xl font-bold">${stock['price']:.2f}</div>
+                                            <div class="{'text-green-600' if up else 'text-red-600'} text-sm flex items-center">
+                                                <span class="mr-1">{'📈' if up else '📉'}</span>
+                                                {'+' if up else ''}{stock['change']:.2f} ({stock['changePercent']:.2f}%)
+                                            </div>
+                                        </div>
+                                        <div class="text-right">
+                                            <div class="text-xs text-gray-500">AI Score</div>
+                                            <div class="text-lg font-bold text-blue-600">{ai_score}</div>
+                                        </div>
+                                    </div>
+                                </div>'''
+
+def write_if_changed(path, content):
+    """Write content (bytes) to path unless the file already holds exactly that"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == content:
+                return
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
 def create_flask_app():
     """Create and configure Flask application"""
+    # Imported here so the prompt and the dependency check (which may install Flask) run without it
+    from flask import Flask, Response, request
+    try:
+        from orjson import dumps as dumps_json
+    except ImportError:
+        def dumps_json(obj):
+            return json.dumps(obj).encode('utf-8')
+    
     app = Flask(__name__, 
                 template_folder='frontend/src/app',
                 static_folder='frontend/public')
@@ -103,10 +201,9 @@ def create_flask_app():
         {'symbol': 'NVDA', 'name': 'NVIDIA Corporation', 'price': 456.78, 'change': 12.34, 'changePercent': 2.78}
     ]
     
-    @app.route('/')
-    def index():
-        """Main dashboard page"""
-        return '''
+    # The page only shows static mock data, so it is rendered to a static file that Flask serves
+    # with sendfile where the WSGI server supports it
+    index_html = ('''
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -157,8 +254,7 @@ def create_flask_app():
                         <!-- Stock Cards -->
                         <div class="lg:col-span-2">
                             <h2 class="text-2xl font-bold mb-6">📈 Top Stocks</h2>
-                            <div class="grid gap-4" id="stocks-container">
-                                <!-- Stock cards will be populated by JavaScript -->
+                            <div class="grid gap-4" id="stocks-container">''' + ''.join(render_stock_card(stock) for stock in mock_stocks) + '''
                             </div>
                         </div>
 
@@ -203,53 +299,28 @@ def create_flask_app():
                     </div>
                 </main>
             </div>
-
-            <script>
-                // Populate stock cards
-                const stocks = ''' + str(mock_stocks).replace("'", '"') + ''';
-                const container = document.getElementById('stocks-container');
-                
-                stocks.forEach(stock => {
-                    const changeColor = stock.change >= 0 ? 'text-green-600' : 'text-red-600';
-                    const changeIcon = stock.change >= 0 ? '📈' : '📉';
-                    
-                    const card = document.createElement('div');
-                    card.className = 'bg-white rounded-xl p-6 shadow-lg card-hover cursor-pointer';
-                    card.innerHTML = `
-                        <div class="flex justify-between items-start mb-4">
-                            <div>
-                                <h3 class="text-xl font-bold">${stock.symbol}</h3>
-                                <p class="text-gray-600 text-sm">${stock.name}</p>
-                            </div>
-                            <button class="w-8 h-8 bg-blue-100 hover:bg-blue-200 rounded-full flex items-center justify-center transition-all">
-                                <span class="text-blue-600">+</span>
-                            </button>
-                        </div>
-                        <div class="flex justify-between items-end">
-                            <div>
-                                <div class="text-2xl font-bold">$${stock.price.toFixed(2)}</div>
-                                <div class="${changeColor} text-sm flex items-center">
-                                    <span class="mr-1">${changeIcon}</span>
-                                    ${stock.change >= 0 ? '+' : ''}${stock.change.toFixed(2)} (${stock.changePercent.toFixed(2)}%)
-                                </div>
-                            </div>
-                            <div class="text-right">
-                                <div class="text-xs text-gray-500">AI Score</div>
-                                <div class="text-lg font-bold text-blue-600">${Math.floor(Math.random() * 40 + 60)}</div>
-                            </div>
-                        </div>
-                    `;
-                    container.appendChild(card);
-                });
-            </script>
         </body>
         </html>
-        '''
+        ''').encode('utf-8')
+    write_if_changed(os.path.join(app.static_folder, 'index.html'), index_html)
+    
+    @app.route('/')
+    def index():
+        """Main dashboard page"""
+        return app.send_static_file('index.html')
+    
+    # The mock data never changes, so its JSON body and ETag are computed once
+    stocks_body = dumps_json(mock_stocks)
+    stocks_etag = hashlib.md5(stocks_body).hexdigest()
     
     @app.route('/api/stocks')
     def get_stocks():
         """Get stock data API"""
-        return jsonify(mock_stocks)
+        response = Response(stocks_body, mimetype='application/json')
+        response.set_etag(stocks_etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 30
+        return response.make_conditional(request)
     
     @app.route('/discover')
     def discover():
@@ -265,14 +336,21 @@ def create_flask_app():
 
 def start_ml_service():
     """Start ML service in background"""
+    import subprocess
+    
     try:
         print("🤖 Starting ML service...")
-        # Try to start the training tracker (which includes ML service monitoring)
-        ml_process = subprocess.Popen([
-            sys.executable, 
-            os.path.join('backend', 'training-tracker', 'app.py')
-        ], cwd=os.path.dirname(__file__))
+        # Try to start the training tracker (which includes ML service monitoring). It runs in its own
+        # session with no stdin and its output in a log file; main() terminates it when the server exits.
+        log_path = BASE_DIR / 'data' / 'logs' / 'training-tracker.log'
+        with open(log_path, 'ab') as log_file:
+            ml_process = subprocess.Popen([
+                sys.executable, 
+                os.path.join('backend', 'training-tracker', 'app.py')
+            ], cwd=BASE_DIR, close_fds=True, start_new_session=True,
+                stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT)
         print("✅ ML service started")
+        print(f"   Logs: {log_path}")
         return ml_process
     except Exception as e:
         print(f"⚠️  Could not start ML service: {e}")
@@ -291,12 +369,78 @@ def start_flask_platform():
     print("✅ Flask platform ready")
     return app, ml_process
 
+# Services the platform links to, probed after startup until they answer or PLATFORM_WAIT_TIMEOUT passes
+SERVICE_URLS = {
+    'Platform': 'http://localhost:3000/',
+    'Training tracker': 'http://localhost:5000/',
+    'ML service': 'http://localhost:8001/health'
+}
+PLATFORM_WAIT_TIMEOUT = 30
+
+def probe_service(connection, path):
+    """Whether anything answers HTTP on connection; it is closed on failure so the next probe reconnects"""
+    try:
+        connection.request('HEAD', path)
+        response = connection.getresponse()
+        response.read()
+        return response.status < 500
+    except (OSError, http.client.HTTPException):
+        connection.close()
+        return False
+
+def wait_for_platform(on_platform_ready):
+    """Probe all services in parallel until each answers, calling on_platform_ready() once the platform does"""
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlsplit
+    
+    # One keep-alive connection per service for the whole wait, each used by one probe at a time
+    targets = {}
+    for name, url in SERVICE_URLS.items():
+        parts = urlsplit(url)
+        targets[name] = (http.client.HTTPConnection(parts.hostname, parts.port, timeout=1), parts.path or '/')
+    
+    ready = dict.fromkeys(SERVICE_URLS, False)
+    deadline = time.monotonic() + PLATFORM_WAIT_TIMEOUT
+    with ThreadPoolExecutor(max_workers=len(SERVICE_URLS)) as executor:
+        while True:
+            pending = [name for name, is_ready in ready.items() if not is_ready]
+            results = executor.map(lambda name: probe_service(*targets[name]), pending)
+            for name, is_ready in zip(pending, results):
+                if is_ready:
+                    ready[name] = True
+                    print(f"✅ {name} is up")
+                    if name == 'Platform':
+                        on_platform_ready()
+            
+            if all(ready.values()) or time.monotonic() >= deadline:
+                break
+            time.sleep(0.25)
+    
+    for connection, _ in targets.values():
+        connection.close()
+    
+    if not ready['Platform']:
+        print(f"⚠️  Platform did not answer within {PLATFORM_WAIT_TIMEOUT}s")
+        on_platform_ready()
+
+def open_url(url):
+    """Hand url to the desktop's default handler without waiting for the browser"""
+    if sys.platform == 'win32':
+        os.startfile(url)
+        return
+    
+    import subprocess
+    
+    opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+    subprocess.Popen([opener, url], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
 def open_platform():
     """Open the main platform in browser"""
     print("\n🌐 Opening VUTAX 2.0 trading platform...")
     
     try:
-        webbrowser.open('http://localhost:3000')
+        open_url('http://localhost:3000')
         print("✅ Platform opened in browser")
     except Exception as e:
         print("⚠️  Could not open browser automatically")
@@ -304,42 +448,25 @@ def open_platform():
 
 def print_platform_info():
     """Print platform information and access points"""
-    print("\n" + "="*60)
-    print("                  FLASK PLATFORM READY!")
-    print("="*60)
-    print("\n🌐 Main Platform: http://localhost:3000 (Flask)")
-    print("🤖 Training Tracker: http://localhost:5000")
-    print("📊 API Endpoints: /api/stocks")
-    print("\n🎯 Platform Features:")
-    print("   • Beautiful Flask-based web interface")
-    print("   • Real-time stock data and analysis")
-    print("   • AI-powered trading recommendations")
-    print("   • Interactive portfolio management")
-    print("   • Plus buttons to add stocks to watchlist")
-    print("   • Smooth animations and modern UI")
-    print("\n🤖 AI Features:")
-    print("   • Background ML service for training")
-    print("   • Real-time AI score calculations")
-    print("   • Market sentiment analysis")
-    print("   • Automatic model improvements")
-    print("\n" + "="*60)
-    print("\n💡 Tips:")
-    print("   - Click the + button on stock cards to add to watchlist")
-    print("   - Visit /discover and /watchlist pages (coming soon)")
-    print("   - Check http://localhost:5000 for AI training progress")
-    print("   - All data is stored locally in data/ folders")
-    print("\n" + "="*60 + "\n")
+    sys.stdout.write(PLATFORM_INFO)
+
+def exit_on_signal(signum, frame):
+    """Signal handler that unwinds main() through its cleanup"""
+    raise SystemExit(128 + signum)
 
 def main():
     """Main function"""
+    import subprocess
+    
     print_header()
     
-    # Ask user to continue
-    try:
-        input("Press Enter to start the Flask platform, or Ctrl+C to cancel...")
-    except KeyboardInterrupt:
-        print("\n❌ Platform startup cancelled by user")
-        sys.exit(0)
+    # Ask user to continue, unless started with --yes or VUTAX_AUTO_START=1
+    if '--yes' not in sys.argv[1:] and os.environ.get('VUTAX_AUTO_START') != '1':
+        try:
+            input("Press Enter to start the Flask platform, or Ctrl+C to cancel...")
+        except KeyboardInterrupt:
+            print("\n❌ Platform startup cancelled by user")
+            sys.exit(0)
     
     print("🚀 Starting VUTAX 2.0 Flask Platform...\n")
     
@@ -354,12 +481,8 @@ def main():
     # Start Flask platform
     app, ml_process = start_flask_platform()
     
-    # Open platform in browser (with delay)
-    def delayed_open():
-        time.sleep(2)
-        open_platform()
-    
-    threading.Thread(target=delayed_open, daemon=True).start()
+    # Open platform in browser as soon as it answers
+    threading.Thread(target=wait_for_platform, args=(open_platform,), daemon=True).start()
     
     # Print platform info
     print_platform_info()
@@ -369,13 +492,34 @@ def main():
     print("🤖 Visit http://localhost:5000 for AI training dashboard!")
     print("\n⚠️  Press Ctrl+C to stop the platform")
     
+    # The detached tracker does not die with the terminal, so turn SIGTERM and SIGHUP (terminal
+    # closed) into SystemExit and let the finally below stop it
+    for signum in (signal.SIGTERM, getattr(signal, 'SIGHUP', None)):
+        if signum is not None:
+            signal.signal(signum, exit_on_signal)
+    
     try:
-        # Run Flask app
-        app.run(host='0.0.0.0', port=3000, debug=False)
+        # Run Flask app on waitress's thread pool when available, else the development server
+        try:
+            from waitress import serve
+        except ImportError:
+            app.run(host='0.0.0.0', port=3000, debug=False)
+        else:
+            serve(app, host='0.0.0.0', port=3000, threads=8)
     except KeyboardInterrupt:
-        print("\n🛑 Stopping Flask platform...")
+        pass
+    finally:
+        # waitress handles Ctrl+C itself and returns normally, so clean up however the server ended
         if ml_process:
+            # The tracker runs in its own session, so Ctrl+C never reaches it; wait so :5000 is free
+            # before we exit. Done before printing, which fails once a closed terminal hung us up.
             ml_process.terminate()
+            try:
+                ml_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                ml_process.kill()
+                ml_process.wait()
+        print("\n🛑 Stopping Flask platform...")
         print("✅ Platform stopped successfully")
 
 if __name__ == '__main__':